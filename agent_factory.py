@@ -0,0 +1,143 @@
+# agent_factory.py
+
+import asyncio
+from collections import OrderedDict
+from langchain.agents import initialize_agent
+from langchain.callbacks.base import BaseCallbackHandler
+from llm_cache import enable_llm_cache
+from llm_handler import get_llm
+from llm_warmup import LLMWarmup
+from token_memory import TokenBudgetMemory, budget_for_model
+from tools import registry
+
+AGENT_CACHE_SIZE = 16  # per-tool-set agents kept by AgentCache
+
+AGENT_SYSTEM_MESSAGE = "You are Rexode, a helpful AI assistant. You have access to various tools to assist the user. Be proactive and use your tools when necessary. If asked for general knowledge, try to answer directly from your training data before resorting to web search. Always provide clear and concise answers."
+
+
+def load_headless_llm(purpose: str, warm_up: bool = True):
+    """
+    (llm, model_name) for front ends with no terminal to prompt on (the daemon,
+    the API server, batches): the provider, model and API key must all come
+    from the env/.rexoderc config. Turns on the response cache and, unless
+    told not to, warms the model up. Raises RuntimeError when anything is missing.
+    """
+    try:
+        llm, model_name = get_llm(interactive=False)
+    except RuntimeError as e:
+        raise RuntimeError(f"{e} Nothing can be asked for when starting {purpose}.")
+    if llm is None:
+        raise RuntimeError(f"Starting {purpose} needs an LLM; local_tools mode isn't supported.")
+    enable_llm_cache(llm, model_name)
+    if warm_up:
+        LLMWarmup(llm).start()  # load the model now, not on the first question
+    return llm, model_name
+
+
+def headless_tools(llm) -> list:
+    """Agent tools for front ends with nobody at the console: the interactive tools are left out."""
+    return registry.as_langchain_tools(llm=llm, exclude=registry.interactive_tools())
+
+
+def create_memory(llm, model_name: str) -> TokenBudgetMemory:
+    """Fresh conversation memory sized for the model; one per conversation."""
+    return TokenBudgetMemory(
+        llm=llm,
+        max_token_limit=budget_for_model(model_name),
+        memory_key="chat_history",
+        return_messages=True,
+        output_key="output"
+    )
+
+
+def create_agent(llm, agent_tools: list, memory):
+    """The Rexode conversational ReAct agent, shared by the REPL and the headless runners."""
+    return initialize_agent(
+        agent_tools,
+        llm,
+        agent= "conversational-react-description",
+        verbose=False,
+        handle_parsing_errors=True,
+        memory=memory,
+        agent_kwargs={
+            "system_message": AGENT_SYSTEM_MESSAGE
+        }
+    )
+
+
+class AgentCache:
+    """
+    Agents sharing one memory, one per tool set the selector picks, so a
+    repeated selection reuses its agent instead of building another. The
+    least recently used is dropped beyond `size`.
+    """
+
+    def __init__(self, llm, memory, size: int = AGENT_CACHE_SIZE):
+        self.llm = llm
+        self.memory = memory
+        self.size = size
+        self.agents = OrderedDict()
+
+    def get(self, agent_tools: list):
+        key = frozenset(tool.name for tool in agent_tools)
+        agent = self.agents.get(key)
+        if agent is None:
+            agent = self.agents[key] = create_agent(self.llm, agent_tools, self.memory)
+            if len(self.agents) > self.size:
+                self.agents.popitem(last=False)
+        self.agents.move_to_end(key)
+        return agent
+
+
+class AgentSession:
+    """
+    One conversation: its own memory and agent. Turns within a session run one
+    at a time. The agent is built on first use, so a request refused before
+    its turn starts never pays for it.
+    """
+
+    def __init__(self, llm, model_name: str, agent_tools: list):
+        self.llm = llm
+        self.agent_tools = agent_tools
+        self.memory = create_memory(llm, model_name)
+        self.lock = asyncio.Lock()
+        self._agent = None
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            self._agent = create_agent(self.llm, self.agent_tools, self.memory)
+        return self._agent
+
+
+class AnswerStreamHandler(BaseCallbackHandler):
+    """
+    Passes each new piece of the agent's final answer to `on_text` while the
+    LLM streams it. The ReAct agent prefixes its final answer with "AI:";
+    thoughts and tool calls before that are never forwarded.
+    """
+    # Run on the event loop thread, in order, so streamed tokens never arrive shuffled
+    run_inline = True
+
+    def __init__(self, on_text, ai_prefix: str = "AI:"):
+        self.on_text = on_text
+        self.ai_prefix = ai_prefix
+        self._llm_buffer = ""
+        self._streamed = 0
+
+    def on_llm_start(self, serialized: dict, prompts: list, **kwargs) -> None:
+        self._llm_buffer = ""
+        self._streamed = 0
+
+    def on_chat_model_start(self, serialized: dict, messages: list, **kwargs) -> None:
+        self.on_llm_start(serialized, [], **kwargs)
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        self._llm_buffer += token
+        marker = self._llm_buffer.find(self.ai_prefix)
+        if marker == -1:
+            return
+        answer = self._llm_buffer[marker + len(self.ai_prefix):].lstrip()
+        if len(answer) > self._streamed:
+            self.on_text(answer[self._streamed:])
+            self._streamed = len(answer)
@@ -0,0 +1,401 @@
+# api_server.py
+"""
+Local HTTP API with OpenAI-style chat completions, so several users (or apps)
+can share one resident Rexode.
+
+Usage: python api_server.py [--host 127.0.0.1] [--port 8765] [--max-concurrency N]
+                            [--max-queue N] [--max-sessions N]
+
+Endpoints:
+  POST /v1/chat/completions  {"model": ..., "messages": [...], "stream": false, "user": "alice"}
+  GET  /v1/models
+  GET  /health               load and session counters
+
+Requests with the same "user" (or X-Rexode-Session header) continue one
+conversation; each session has its own agent and memory. Without one, the
+request's earlier messages seed a throwaway session. Tools and the web,
+page and LLM caches are shared by all sessions. At most --max-concurrency
+turns run at once and --max-queue more may wait (for a slot, or for an
+earlier turn of the same session); beyond that, or after waiting a minute,
+the server answers 429 with Retry-After. If REXODE_API_KEY is set it must
+be sent as a Bearer token; it is required to listen on anything but
+loopback. Requests from browsers (with an Origin header) are refused, and
+chat completions must be sent as application/json. The LLM comes from the
+env/.rexoderc config.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from rich.console import Console
+
+from agent_factory import AgentSession, AnswerStreamHandler, headless_tools, load_headless_llm
+from tools import close_web_tools
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENCY = 4  # agent turns running at once
+DEFAULT_MAX_QUEUE = 16  # turns allowed to wait for a slot before we answer 429
+DEFAULT_MAX_SESSIONS = 100  # least recently used idle sessions are dropped beyond this
+MAX_BODY_BYTES = 1024 * 1024
+TURN_TIMEOUT = 300.0  # seconds
+QUEUE_TIMEOUT = 60.0  # seconds a turn may wait for its session and a slot before we answer 429
+RETRY_AFTER = 2  # seconds, sent with 429
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 415: "Unsupported Media Type", 429: "Too Many Requests", 500: "Internal Server Error", 504: "Gateway Timeout"}
+
+console = Console()
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """(method, path, headers, body) for the next request on the connection, or None once the client hangs up."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], headers, body
+
+
+def write_head(writer: asyncio.StreamWriter, status: int, headers: dict):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}"] + [f"{k}: {v}" for k, v in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+
+def write_json(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool = True, extra: dict = None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Content-Length": len(body),
+               "Connection": "keep-alive" if keep_alive else "close"}
+    headers.update(extra or {})
+    write_head(writer, status, headers)
+    writer.write(body)
+
+
+def error_payload(message: str, kind: str = "invalid_request_error") -> dict:
+    return {"error": {"message": message, "type": kind}}
+
+
+class ApiServer:
+    def __init__(self, llm, model_name: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_queue: int = DEFAULT_MAX_QUEUE, max_sessions: int = DEFAULT_MAX_SESSIONS, api_key: str = None):
+        self.llm = llm
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_sessions = max_sessions
+        self.api_key = api_key
+        self.agent_tools = headless_tools(llm)
+        self.sessions = OrderedDict()
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+        self.failed = 0
+
+    # ---- sessions and admission ----
+
+    def session(self, name: str) -> AgentSession:
+        session = self.sessions.get(name)
+        if session is None:
+            while len(self.sessions) >= self.max_sessions:
+                # Make room by dropping the least recently used idle session; refuse if none is idle
+                idle = next((k for k, s in self.sessions.items() if not s.lock.locked()), None)
+                if idle is None:
+                    self.rejected += 1
+                    raise HttpError(429, f"Server busy: all {len(self.sessions)} sessions are in use")
+                del self.sessions[idle]
+            session = self.sessions[name] = AgentSession(self.llm, self.model_name, self.agent_tools)
+        self.sessions.move_to_end(name)
+        return session
+
+    def transient_session(self, history: list) -> AgentSession:
+        """A throwaway session whose memory holds the request's earlier messages."""
+        session = AgentSession(self.llm, self.model_name, self.agent_tools)
+        for message in history:
+            if message.get("role") == "user":
+                session.memory.chat_memory.add_user_message(str(message.get("content", "")))
+            elif message.get("role") == "assistant":
+                session.memory.chat_memory.add_ai_message(str(message.get("content", "")))
+        return session
+
+    async def admit(self, session: AgentSession):
+        """
+        Waits until the session is free and a turn slot is open. Waiting for
+        either counts against the queue: refuses at once when it is already
+        full, and after QUEUE_TIMEOUT seconds in it.
+        """
+        if (session.lock.locked() or self.slots.locked()) and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HttpError(429, f"Server busy: {self.active} turns running, {self.waiting} waiting")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._acquire(session), QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HttpError(429, f"Server busy: no turn slot within {QUEUE_TIMEOUT:.0f}s")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    async def _acquire(self, session: AgentSession):
+        await session.lock.acquire()
+        try:
+            await self.slots.acquire()
+        except BaseException:
+            session.lock.release()
+            raise
+
+    def release(self, session: AgentSession):
+        self.active -= 1
+        self.slots.release()
+        session.lock.release()
+
+    # ---- HTTP ----
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    self.check_auth(headers)
+                    self.check_origin(method, headers)
+                    keep_alive = await self.route(writer, method, path, headers, body) and keep_alive
+                except HttpError as e:
+                    keep_alive = e.status not in (400, 413)
+                    extra = {"Retry-After": RETRY_AFTER} if e.status == 429 else None
+                    kind = "rate_limit_error" if e.status == 429 else "invalid_request_error"
+                    write_json(writer, e.status, error_payload(e.message, kind), keep_alive, extra)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    # A bug shouldn't cost the client its answer; report it and drop the connection
+                    keep_alive = False
+                    write_json(writer, 500, error_payload(f"{type(e).__name__}: {e}", "server_error"), keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # the client went away
+        finally:
+            writer.close()
+
+    def check_auth(self, headers: dict):
+        if self.api_key and headers.get("authorization") != f"Bearer {self.api_key}":
+            raise HttpError(401, "Missing or invalid API key")
+
+    def check_origin(self, method: str, headers: dict):
+        """
+        Keeps web pages out. The agent can write files and launch programs, and
+        without this any page the user opens could POST to 127.0.0.1. API
+        clients don't send Origin, but browsers do. Browsers also can't send
+        application/json cross-origin without a CORS preflight, which we never
+        grant.
+        """
+        if "origin" in headers:
+            raise HttpError(403, "Browser requests are not accepted")
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        if method == "POST" and content_type != "application/json":
+            raise HttpError(415, "Content-Type must be application/json")
+
+    async def route(self, writer, method: str, path: str, headers: dict, body: bytes) -> bool:
+        """Answers one request; returns False when the connection must be closed afterwards."""
+        if path == "/health":
+            write_json(writer, 200, {
+                "model": self.model_name, "active": self.active, "waiting": self.waiting,
+                "max_concurrency": self.max_concurrency, "max_queue": self.max_queue,
+                "sessions": len(self.sessions), "served": self.served, "rejected": self.rejected,
+                "failed": self.failed,
+            })
+            return True
+        if path == "/v1/models":
+            write_json(writer, 200, {"object": "list", "data": [{"id": self.model_name, "object": "model",
+                                                                 "owned_by": "rexode"}]})
+            return True
+        if path != "/v1/chat/completions":
+            raise HttpError(404, f"No route for {path}")
+        if method != "POST":
+            raise HttpError(405, "Use POST")
+
+        try:
+            payload = json.loads(body or b"{}")
+            messages = payload["messages"]
+            prompt = str(messages[-1]["content"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise HttpError(400, "Body must be JSON with a non-empty 'messages' list")
+
+        session_name = headers.get("x-rexode-session") or payload.get("user")
+        session = self.session(str(session_name)) if session_name else self.transient_session(messages[:-1])
+        if payload.get("stream"):
+            return await self.complete_stream(writer, session, prompt)
+        output = await self.run_turn(session, prompt)
+        write_json(writer, 200, self.completion(output))
+        return True
+
+    # ---- chat completions ----
+
+    async def run_turn(self, session: AgentSession, prompt: str, handler: AnswerStreamHandler = None,
+                       on_chunk=None) -> str:
+        await self.admit(session)
+        try:
+            output = ""
+            config = {"callbacks": [handler]} if handler else {}
+            stream = session.agent.astream({"input": prompt}, config=config)
+
+            async def consume():
+                nonlocal output
+                async for chunk in stream:
+                    if "output" in chunk:
+                        output += chunk["output"]
+                    if on_chunk is not None:
+                        await on_chunk()
+
+            await asyncio.wait_for(consume(), TURN_TIMEOUT)
+            self.served += 1
+            return output
+        except asyncio.TimeoutError:
+            self.failed += 1
+            raise HttpError(504, f"Turn took longer than {TURN_TIMEOUT:.0f}s")
+        except Exception as e:
+            self.failed += 1
+            raise HttpError(500, f"{type(e).__name__}: {e}")
+        finally:
+            self.release(session)
+
+    def completion(self, output: str) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.model_name,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": output}, "finish_reason": "stop"}],
+        }
+
+    async def complete_stream(self, writer: asyncio.StreamWriter, session: AgentSession, prompt: str) -> bool:
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        started = False
+        streamed = False
+
+        def event(delta: dict, finish_reason=None):
+            nonlocal started
+            if not started:
+                # Headers go out with the first event, so a 429 can still be a normal JSON error
+                write_head(writer, 200, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache",
+                                         "Connection": "close"})
+                started = True
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                     "model": self.model_name,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            writer.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        def on_text(text: str):
+            nonlocal streamed
+            if not streamed:
+                event({"role": "assistant"})
+                streamed = True
+            event({"content": text})
+
+        try:
+            output = await self.run_turn(session, prompt, AnswerStreamHandler(on_text), writer.drain)
+        except HttpError as e:
+            if not started:
+                raise
+            writer.write(f"data: {json.dumps(error_payload(e.message, 'server_error'))}\n\n".encode("utf-8"))
+            return False
+        if not streamed:
+            # The model didn't stream (or answered without the "AI:" prefix): send it whole
+            event({"role": "assistant", "content": output})
+        event({}, "stop")
+        writer.write(b"data: [DONE]\n\n")
+        return False
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None):
+        if not self.api_key and not is_loopback(host):
+            raise RuntimeError(f"Set REXODE_API_KEY before serving on {host}: anyone who can reach it "
+                               "could drive the agent and its file and shell tools.")
+        server = await asyncio.start_server(self.handle, host, port)
+        console.print(f"Rexode API on http://{host}:{port}/v1 ({self.model_name}, "
+                      f"{self.max_concurrency} concurrent turns, queue {self.max_queue})", style="bold green")
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await close_web_tools()
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a hostname, or "" for every interface
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+
+
+async def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve Rexode over an OpenAI-compatible HTTP API.")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        llm, model_name = load_headless_llm("the API server")
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        return 2
+
+    server = ApiServer(llm, model_name, args.max_concurrency, args.max_queue, args.max_sessions,
+                       api_key=os.environ.get("REXODE_API_KEY"))
+    try:
+        await server.serve(args.host, args.port)
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,198 @@
+# batch_runner.py
+"""
+Runs a JSONL file of prompts through Rexode without the REPL.
+
+Usage: python batch_runner.py PROMPTS.jsonl [-o RESULTS.jsonl] [--concurrency N]
+                              [--tool TOOL_NAME] [--timeout SECONDS] [--retry-errors]
+
+Each input line is a JSON object. Its id is "id" or "request_id" (default:
+the line number). Its prompt is "prompt" or "input", or else "title" and
+"body" joined. Every prompt runs through the agent with its own fresh
+memory, or straight through one tool with --tool. A result line is
+appended to the output as soon as that prompt finishes. Rerunning with the
+same output file skips the prompts it already holds, so an interrupted
+sweep resumes where it stopped.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from rich.console import Console
+
+from agent_factory import create_agent, create_memory, headless_tools, load_headless_llm
+from tools import registry, close_web_tools
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 600.0  # seconds per prompt
+
+console = Console()
+
+
+def load_prompts(path: str) -> list:
+    """[(id, record)] for every non-empty line of the input JSONL."""
+    prompts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            prompt_id = str(record.get("id") or record.get("request_id") or line_no)
+            prompts.append((prompt_id, record))
+    return prompts
+
+
+def prompt_text(record: dict) -> str:
+    if record.get("prompt") or record.get("input"):
+        return str(record.get("prompt") or record.get("input"))
+    return "\n\n".join(str(record[key]) for key in ("title", "body") if record.get(key))
+
+
+def load_finished(path: str, retry_errors: bool = False) -> set:
+    """Ids already in the output file; a line cut short by a crash is ignored."""
+    finished = set()
+    if not os.path.exists(path):
+        return finished
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if retry_errors and result.get("status") != "ok":
+                continue
+            finished.add(str(result.get("id")))
+    return finished
+
+
+class ResultWriter:
+    """Appends one JSON line per finished prompt and syncs it, so a crash loses at most the line in flight."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a+b")
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell():
+            self._file.seek(-1, os.SEEK_END)
+            if self._file.read(1) != b"\n":
+                self._file.write(b"\n")  # terminate a line a crash left half written
+
+    def write(self, result: dict):
+        self._file.write((json.dumps(result, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class BatchRunner:
+    """
+    Runs prompts with at most `concurrency` in flight. Each agent run gets its
+    own memory and agent, so prompts never see each other's conversation.
+    Console-interactive tools are left out, since nobody is there to answer them.
+    """
+
+    def __init__(self, llm, model_name: str, tool: str = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.llm = llm
+        self.model_name = model_name
+        self.tool = tool
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.agent_tools = None if tool else headless_tools(llm)
+
+    async def _answer(self, text: str) -> str:
+        if self.tool:
+            return str(await registry.acall(self.tool, text, llm=self.llm))
+        agent = create_agent(self.llm, self.agent_tools, create_memory(self.llm, self.model_name))
+        result = await agent.ainvoke({"input": text})
+        return result.get("output", "")
+
+    async def _run_one(self, semaphore: asyncio.Semaphore, prompt_id: str, record: dict) -> dict:
+        async with semaphore:
+            started_at = datetime.now().isoformat(timespec="seconds")
+            start = time.perf_counter()
+            result = {"id": prompt_id, "started_at": started_at, "model": self.model_name, "tool": self.tool}
+            try:
+                result["output"] = await asyncio.wait_for(self._answer(prompt_text(record)), self.timeout)
+                result["status"] = "ok"
+            except asyncio.TimeoutError:
+                result["status"] = "error"
+                result["error"] = f"Timed out after {self.timeout:.0f}s"
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["seconds"] = round(time.perf_counter() - start, 3)
+            return result
+
+    async def run(self, prompts: list, writer: ResultWriter) -> dict:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._run_one(semaphore, prompt_id, record)) for prompt_id, record in prompts]
+        counts = {"ok": 0, "error": 0}
+        try:
+            for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                result = await next_result
+                writer.write(result)
+                counts[result["status"]] += 1
+                style = "green" if result["status"] == "ok" else "red"
+                console.print(f"[{done}/{len(tasks)}] {result['id']}: [{style}]{result['status']}[/{style}] "
+                              f"in {result['seconds']:.1f}s")
+        finally:
+            for task in tasks:
+                task.cancel()
+        return counts
+
+
+async def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a JSONL file of prompts through Rexode.")
+    parser.add_argument("input", help="JSONL file of prompts")
+    parser.add_argument("-o", "--output", help="results JSONL (default: <input>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--tool", help="run every prompt through this tool instead of the agent")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per prompt")
+    parser.add_argument("--retry-errors", action="store_true", help="rerun prompts whose last result was an error")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.input)[0] + ".results.jsonl"
+    if args.tool and args.tool not in registry:
+        console.print(f"Unknown tool: {args.tool}", style="bold red")
+        return 2
+    if args.tool and registry.get(args.tool).interactive:
+        console.print(f"{args.tool} asks for confirmation on the console, so it can't run in a batch.", style="bold red")
+        return 2
+
+    needs_llm = not args.tool or registry.get(args.tool).needs_llm
+    llm, model_name = None, ""
+    if needs_llm:
+        try:
+            # The first prompts start right away, so there's nothing for a warm-up to hide
+            llm, model_name = load_headless_llm("a batch", warm_up=False)
+        except RuntimeError as e:
+            console.print(str(e), style="bold red")
+            return 2
+
+    prompts = load_prompts(args.input)
+    finished = load_finished(output, args.retry_errors)
+    pending = [(prompt_id, record) for prompt_id, record in prompts if prompt_id not in finished]
+    console.print(f"{len(prompts)} prompts, {len(prompts) - len(pending)} already done, "
+                  f"running {len(pending)} with concurrency {args.concurrency} -> {output}", style="bold green")
+
+    writer = ResultWriter(output)
+    start = time.perf_counter()
+    try:
+        runner = BatchRunner(llm, model_name, args.tool, args.concurrency, args.timeout)
+        counts = await runner.run(pending, writer)
+    finally:
+        writer.close()
+        await close_web_tools()
+    console.print(f"Done in {time.perf_counter() - start:.1f}s: {counts['ok']} ok, {counts['error']} failed.",
+                  style="bold green")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,86 @@
+"""
+Compares the bounded HTML-to-text extractor with the old BeautifulSoup path.
+
+Usage: python benchmarks/bench_html_extract.py [corpus_dir] [--repeat N] [--max-chars N]
+
+Every *.html file in the corpus directory (default: benchmarks/html_corpus) is
+extracted with both engines; html_corpus/README.md lists where each page came
+from. CPU time is the mean process time over N runs; peak memory is measured
+with tracemalloc on a separate single run.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.html_extractor import extract_text
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_corpus")
+
+
+def extract_with_bs4(html: str, max_chars: int) -> str:
+    """The extraction headless_search used before core.html_extractor."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    for s in soup(['script', 'style']):
+        s.decompose()
+    content = ' '.join(soup.body.get_text().split())
+    return content[:max_chars]
+
+
+def measure(fn, html: str, max_chars: int, repeat: int):
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(html, max_chars)
+    cpu_ms = (time.process_time() - start) / repeat * 1000
+
+    tracemalloc.start()
+    fn(html, max_chars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-chars", type=int, default=2000)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.corpus, "*.html")))
+    if not files:
+        print(f"No .html files found in {args.corpus}")
+        return 1
+
+    engines = [("bounded", extract_text)]
+    try:
+        import bs4  # noqa: F401
+        engines.append(("bs4", extract_with_bs4))
+    except ImportError:
+        print("beautifulsoup4 is not installed; only the bounded extractor is measured.\n")
+
+    print(f"{'page':<28}{'size KB':>9}  " + "  ".join(f"{name + ' CPU ms':>14}{name + ' peak KB':>16}" for name, _ in engines))
+    totals = {name: [0.0, 0.0] for name, _ in engines}
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        row = f"{os.path.basename(path)[:27]:<28}{len(html) / 1024:>9.1f}  "
+        for name, fn in engines:
+            cpu_ms, peak_kb = measure(fn, html, args.max_chars, args.repeat)
+            totals[name][0] += cpu_ms
+            totals[name][1] += peak_kb
+            row += f"{cpu_ms:>14.2f}{peak_kb:>16.1f}  "
+        print(row)
+
+    print()
+    for name, (cpu_ms, peak_kb) in totals.items():
+        print(f"{name:<8} mean per page: {cpu_ms / len(files):.2f} ms CPU, {peak_kb / len(files):.1f} KB peak")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
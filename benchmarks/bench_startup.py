@@ -0,0 +1,69 @@
+"""
+Cold-start regression check for the tool registry.
+
+Usage: python benchmarks/bench_startup.py [--budget SECONDS] [--repeat N] [--module NAME]
+
+Imports the module (default: tools) in a fresh interpreter N times and reports
+the best wall time. Exits non-zero if that exceeds the budget or if any of the
+heavyweight tool dependencies got imported along the way, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = 1.5  # seconds for `import tools`, dominated by langchain itself
+
+# Only imported when a tool that needs them is first called
+HEAVY_MODULES = ["playwright", "bs4", "duckduckgo_search", "pyautogui", "pytesseract", "pywhatkit", "pyttsx3"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def cold_import(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--module", default="tools")
+    args = parser.parse_args()
+
+    try:
+        runs = [cold_import(args.module) for _ in range(args.repeat)]
+    except RuntimeError as e:
+        print(f"Could not import {args.module}: {e}")
+        return 2
+
+    best = min(run["seconds"] for run in runs)
+    heavy = sorted({m for run in runs for m in run["heavy"]})
+    print(f"import {args.module}: best {best * 1000:.0f} ms over {args.repeat} cold runs (budget {args.budget * 1000:.0f} ms)")
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+
+    if best > args.budget or heavy:
+        print("FAIL")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
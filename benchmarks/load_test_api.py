@@ -0,0 +1,181 @@
+"""
+Offline load test for api_server.py, using a fake LLM.
+
+Usage: python benchmarks/load_test_api.py [--users N] [--requests-per-user N] [--stream]
+                                          [--llm-latency SECONDS] [--tokens N]
+                                          [--max-concurrency N] [--max-queue N]
+
+Starts the API server in a subprocess, with a fake LLM that streams a canned
+final answer: --tokens tokens spread over --llm-latency seconds, with no
+network and no model. Then N simulated users each send their requests one
+after another over a keep-alive connection, each user in their own
+session. Reports throughput, latency percentiles (plus time to first token
+with --stream) and how many requests were refused with 429.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_PORT = 8799
+
+
+def make_fake_llm(latency: float, tokens: int):
+    from langchain.llms.base import LLM
+
+    class FakeReActLLM(LLM):
+        """Answers every prompt directly ("AI: ..."), streaming tokens at a fixed pace."""
+        latency: float = 0.5
+        tokens: int = 20
+
+        @property
+        def _llm_type(self) -> str:
+            return "fake-react"
+
+        def _reply(self) -> list:
+            words = [f" word{i}" for i in range(self.tokens)]
+            return ["Thought: Do I need to use a tool? No\n", "AI:"] + words
+
+        def _call(self, prompt, stop=None, run_manager=None, **kwargs) -> str:
+            time.sleep(self.latency)
+            return "".join(self._reply())
+
+        async def _acall(self, prompt, stop=None, run_manager=None, **kwargs) -> str:
+            pieces = self._reply()
+            for piece in pieces:
+                await asyncio.sleep(self.latency / len(pieces))
+                if run_manager is not None:
+                    await run_manager.on_llm_new_token(piece)
+            return "".join(pieces)
+
+    return FakeReActLLM(latency=latency, tokens=tokens)
+
+
+async def serve(args):
+    from api_server import ApiServer
+    llm = make_fake_llm(args.llm_latency, args.tokens)
+    server = ApiServer(llm, "fake-react", args.max_concurrency, args.max_queue)
+    await server.serve("127.0.0.1", args.port)
+
+
+async def http_request(reader, writer, port: int, payload: dict):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"POST /v1/chat/completions HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def run_user(user: int, args, results: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+    try:
+        for n in range(args.requests_per_user):
+            payload = {"model": "fake-react", "user": f"user{user}", "stream": args.stream,
+                       "messages": [{"role": "user", "content": f"Question {n} from user {user}"}]}
+            start = time.perf_counter()
+            status, headers = await http_request(reader, writer, args.port, payload)
+            ttft = None
+            if "content-length" in headers:
+                await reader.readexactly(int(headers["content-length"]))
+            else:
+                # Server-sent events until [DONE]; the server closes the connection afterwards
+                async for line in reader:
+                    if ttft is None and b'"content"' in line:
+                        ttft = time.perf_counter() - start
+                    if line.strip() == b"data: [DONE]":
+                        break
+            results.append({"status": status, "seconds": time.perf_counter() - start, "ttft": ttft})
+            if status == 429:
+                await asyncio.sleep(float(headers.get("retry-after", 1)))
+            if headers.get("connection") == "close":
+                writer.close()
+                reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+    finally:
+        writer.close()
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def wait_for_server(port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API server didn't start")
+
+
+async def load_test(args) -> int:
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port),
+         "--llm-latency", str(args.llm_latency), "--tokens", str(args.tokens),
+         "--max-concurrency", str(args.max_concurrency), "--max-queue", str(args.max_queue)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        await wait_for_server(args.port)
+        results = []
+        start = time.perf_counter()
+        await asyncio.gather(*(run_user(user, args, results) for user in range(args.users)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["seconds"] * 1000 for r in ok]
+    print(f"{len(results)} requests from {args.users} users in {elapsed:.1f}s: "
+          f"{len(ok) / elapsed:.1f} ok/s, {sum(r['status'] == 429 for r in results)} refused (429), "
+          f"{sum(r['status'] not in (200, 429) for r in results)} failed")
+    print(f"latency ms  p50 {percentile(latencies, 50):.0f}  p95 {percentile(latencies, 95):.0f}  "
+          f"p99 {percentile(latencies, 99):.0f}  max {max(latencies, default=float('nan')):.0f}")
+    ttfts = [r["ttft"] * 1000 for r in ok if r["ttft"] is not None]
+    if ttfts:
+        print(f"first token ms  p50 {percentile(ttfts, 50):.0f}  p95 {percentile(ttfts, 95):.0f}")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--requests-per-user", type=int, default=10)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake LLM call")
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(serve(args))
+        return 0
+    return asyncio.run(load_test(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# chat_index.py
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from chat_logger import get_log_path, list_log_files, load_manifest, open_log_file
+from utils import split_input
+
+INDEX_PATH = os.path.join(".rexode", "cache", "chat_index.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed_files (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    byte_offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    day TEXT NOT NULL,
+    timestamp TEXT,
+    speaker TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_day ON messages(day);
+CREATE INDEX IF NOT EXISTS messages_path ON messages(path);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id', tokenize='porter unicode61'
+);
+"""
+
+SPEAKERS = {"user": "You: ", "rexode": "Rexode: "}
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class ChatIndex:
+    """
+    Full-text index over the chat journals. Each journal's indexed byte offset
+    is stored, so refreshing only parses lines appended since the last run.
+    When a closed day gets compressed, its rows are re-pointed at the new file
+    instead of being parsed again.
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def refresh(self) -> int:
+        """Indexes new journal lines; returns the number of messages added."""
+        added = 0
+        manifest_days = load_manifest().get("days", {})
+        with self._lock, self._conn:
+            known = {
+                path: (inode, offset)
+                for path, inode, offset in self._conn.execute("SELECT path, inode, byte_offset FROM indexed_files")
+            }
+            seen = set()
+            for day, path in list_log_files():
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                if path.endswith(".jsonl"):
+                    inode, offset = known.get(path, (st.st_ino, 0))
+                    if inode != st.st_ino or st.st_size < offset:
+                        # Journal was replaced or rewritten (e.g. by the migrator); start it over
+                        self._forget(path)
+                        offset = 0
+                    if st.st_size > offset:
+                        added += self._index_plain(path, day, st.st_ino, offset)
+                    continue
+
+                # Compressed closed day: the byte offset holds the compressed size
+                if known.get(path) == (st.st_ino, st.st_size):
+                    continue
+                plain = get_log_path(day)
+                info = manifest_days.get(day, {})
+                if path not in known and plain in known and known[plain][1] == info.get("raw_bytes"):
+                    # Same lines we already indexed from the .jsonl, now compressed
+                    self._conn.execute("UPDATE messages SET path = ? WHERE path = ?", (path, plain))
+                    self._conn.execute("DELETE FROM indexed_files WHERE path = ?", (plain,))
+                else:
+                    self._forget(path)
+                    if not os.path.exists(plain):
+                        self._forget(plain)
+                    with open_log_file(path) as f:
+                        added += self._index_lines(path, day, f)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO indexed_files (path, inode, byte_offset) VALUES (?, ?, ?)",
+                    (path, st.st_ino, st.st_size),
+                )
+
+            for path in known:
+                if path not in seen and not os.path.exists(path):
+                    self._forget(path)
+        return added
+
+    def _forget(self, path: str):
+        for row_id, text in self._conn.execute("SELECT id, text FROM messages WHERE path = ?", (path,)).fetchall():
+            self._conn.execute(
+                "INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', ?, ?)", (row_id, text)
+            )
+        self._conn.execute("DELETE FROM messages WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM indexed_files WHERE path = ?", (path,))
+
+    def _index_plain(self, path: str, day: str, inode: int, offset: int) -> int:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # Only consume complete lines; a half-written last line is picked up next time
+        end = data.rfind(b"\n") + 1
+        added = self._index_lines(path, day, data[:end].splitlines())
+        self._conn.execute(
+            "INSERT OR REPLACE INTO indexed_files (path, inode, byte_offset) VALUES (?, ?, ?)",
+            (path, inode, offset + end),
+        )
+        return added
+
+    def _index_lines(self, path: str, day: str, lines) -> int:
+        added = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            for speaker, prefix in SPEAKERS.items():
+                text = (entry.get(speaker) or "").strip()
+                if text.startswith(prefix):
+                    text = text[len(prefix):]
+                if not text:
+                    continue
+                row_id = self._conn.execute(
+                    "INSERT INTO messages (path, day, timestamp, speaker, text) VALUES (?, ?, ?, ?, ?)",
+                    (path, day, entry.get("timestamp"), speaker, text),
+                ).lastrowid
+                self._conn.execute("INSERT INTO messages_fts (rowid, text) VALUES (?, ?)", (row_id, text))
+                added += 1
+        return added
+
+    def search(self, query: str, start_date: str = None, end_date: str = None,
+               speaker: str = None, limit: int = 10) -> list:
+        """
+        Returns matching messages, best first. Dates are inclusive YYYY-MM-DD
+        bounds; speaker is "user" or "rexode".
+        """
+        self.refresh()
+        terms = _WORD.findall(query)
+        if not terms:
+            return []
+        sql = """
+            SELECT m.timestamp, m.speaker, snippet(messages_fts, 0, '', '', ' … ', 32)
+            FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid
+            WHERE messages_fts MATCH ?
+        """
+        filters = []
+        if start_date:
+            sql += " AND m.day >= ?"
+            filters.append(start_date)
+        if end_date:
+            sql += " AND m.day <= ?"
+            filters.append(end_date)
+        if speaker:
+            sql += " AND m.speaker = ?"
+            filters.append(speaker)
+        sql += " ORDER BY rank LIMIT ?"
+
+        for operator in (" ", " OR "):
+            fts_query = operator.join(f'"{term}"' for term in terms)
+            with self._lock:
+                rows = self._conn.execute(sql, [fts_query, *filters, limit]).fetchall()
+            if rows:
+                return [{"timestamp": ts, "speaker": who, "snippet": snippet} for ts, who, snippet in rows]
+        return []
+
+
+_index = None
+
+
+def get_chat_index() -> ChatIndex:
+    global _index
+    if _index is None:
+        _index = ChatIndex()
+    return _index
+
+
+def search_chat_history(text: str) -> str:
+    """
+    Searches past conversations.
+    Input: query|||start_date|||end_date|||speaker (everything after the query is optional).
+    """
+    parts = split_input(text)
+    query = parts[0]
+    start_date = parts[1] if len(parts) > 1 and parts[1] else None
+    end_date = parts[2] if len(parts) > 2 and parts[2] else None
+    speaker = parts[3].lower() if len(parts) > 3 and parts[3] else None
+    if speaker in ("you", "me"):
+        speaker = "user"
+    if speaker and speaker not in SPEAKERS:
+        return "⚠️ Speaker must be 'user' or 'rexode'."
+    try:
+        results = get_chat_index().search(query, start_date, end_date, speaker)
+    except Exception as e:
+        return f"❌ Error searching chat history: {e}"
+    if not results:
+        return "No matching messages found in chat history."
+    names = {"user": "You", "rexode": "Rexode"}
+    return "\n".join(f"[{r['timestamp']}] {names[r['speaker']]}: {r['snippet']}" for r in results)
@@ -1,36 +1,441 @@
 # chat_logger.py
 
+import atexit
+import glob
+import gzip
+import io
 import json
 import os
+import queue
+import re
+import threading
+import time
 from datetime import datetime
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 CHAT_LOG_FOLDER = "chat_history"
+MANIFEST_PATH = os.path.join(CHAT_LOG_FOLDER, "manifest.json")
+
+# Closed days are compressed in the background: "gzip", "zstd" (needs the
+# zstandard package, otherwise gzip is used) or "none".
+COMPRESSION = os.environ.get("REXODE_CHAT_COMPRESSION", "gzip").lower()
+
+_LOG_NAME = re.compile(r"^rexode_chat_(\d{4}-\d{2}-\d{2})\.jsonl(\.gz|\.zst)?$")
+
+# When to fsync the journal: "always" (every entry), "interval" (at most every
+# FSYNC_INTERVAL seconds) or "never" (leave it to the OS). Entries are always
+# flushed to the OS so other readers see them immediately.
+FSYNC_POLICY = os.environ.get("REXODE_CHAT_FSYNC", "interval").lower()
+FSYNC_INTERVAL = 5.0
+
+# Background writer: a batch is written once it holds BATCH_SIZE entries or its
+# oldest entry has waited BATCH_DELAY seconds.
+QUEUE_SIZE = 1000
+BATCH_SIZE = 50
+BATCH_DELAY = 0.5
 
 def ensure_log_folder():
     if not os.path.exists(CHAT_LOG_FOLDER):
         os.makedirs(CHAT_LOG_FOLDER)
 
+def get_log_path(day: str) -> str:
+    return os.path.join(CHAT_LOG_FOLDER, f"rexode_chat_{day}.jsonl")
+
 def get_today_log_path():
     today = datetime.now().strftime("%Y-%m-%d")
-    return os.path.join(CHAT_LOG_FOLDER, f"rexode_chat_{today}.json")
+    return get_log_path(today)
 
-def append_chat(user_msg: str, ai_msg: str):
-    ensure_log_folder()
-    log_path = get_today_log_path()
-    
-    log_data = []
-    if os.path.exists(log_path):
-        with open(log_path, "r", encoding="utf-8") as f:
+class ChatJournal:
+    """
+    Append-only JSONL chat log: one JSON object per line, written through a
+    single buffered handle that is reopened when the day changes.
+    """
+
+    def __init__(self, fsync_policy: str = FSYNC_POLICY, fsync_interval: float = FSYNC_INTERVAL):
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._handle = None
+        self._path = None
+        self._last_fsync = 0.0
+
+    def _open_for_today(self):
+        path = get_today_log_path()
+        if path != self._path:
+            rotated = self._path is not None
+            self._close_handle()
+            ensure_log_folder()
+            self._handle = open(path, "a", encoding="utf-8", buffering=64 * 1024)
+            self._path = path
+            if rotated:
+                compress_closed_days_async()
+
+    def write_many(self, entries: list):
+        if not entries:
+            return
+        with self._lock:
+            self._open_for_today()
+            self._handle.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+            self._handle.flush()
+            now = time.monotonic()
+            if self.fsync_policy == "always" or (
+                self.fsync_policy == "interval" and now - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._handle.fileno())
+                self._last_fsync = now
+
+    def write(self, entry: dict):
+        self.write_many([entry])
+
+    def _close_handle(self):
+        if self._handle is not None:
+            try:
+                self._handle.flush()
+                if self.fsync_policy != "never":
+                    os.fsync(self._handle.fileno())
+            finally:
+                self._handle.close()
+                self._handle = None
+                self._path = None
+
+    def close(self):
+        with self._lock:
+            self._close_handle()
+
+class ChatLogWriter:
+    """
+    Moves chat logging off the REPL thread: entries go into a bounded queue and
+    a daemon thread writes them to the journal in batches. If the queue is full
+    the caller writes synchronously instead of dropping the entry.
+    """
+
+    def __init__(self, journal: ChatJournal, queue_size: int = QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE, batch_delay: float = BATCH_DELAY):
+        self.journal = journal
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # Counters
+        self.written = 0
+        self.flushes = 0
+        self.sync_fallbacks = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, entry: dict):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.sync_fallbacks += 1
+            self._write_batch([entry])
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_delay
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
             try:
-                log_data = json.load(f)
-            except json.JSONDecodeError:
-                log_data = []
+                self._write_batch(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: list):
+        start = time.perf_counter()
+        try:
+            self.journal.write_many(batch)
+        except Exception as e:
+            print(f"[DEBUG] Chat log write failed: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.written += len(batch)
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
 
-    log_data.append({
+    def flush(self):
+        """Blocks until every entry queued so far has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0):
+        """Drains the queue, stops the writer thread and closes the journal."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self.journal.close()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "written": self.written,
+            "flushes": self.flushes,
+            "sync_fallbacks": self.sync_fallbacks,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+        }
+
+_journal = ChatJournal()
+_writer = ChatLogWriter(_journal)
+atexit.register(_writer.close)
+
+def make_entry(user_msg: str, ai_msg: str) -> dict:
+    return {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "user": user_msg,
         "rexode": ai_msg
-    })
+    }
+
+def append_chat(user_msg: str, ai_msg: str):
+    """Queues a chat entry for the background writer; returns immediately."""
+    _writer.submit(make_entry(user_msg, ai_msg))
+
+def flush_chat_log():
+    _writer.flush()
+
+def close_chat_log():
+    _writer.close()
+
+def chat_log_stats() -> dict:
+    return _writer.stats()
+
+# ========== Reading ==========
+
+def open_log_file(path: str):
+    """Opens a day's journal for text reading, whether plain, gzip or zstd."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed but the zstandard package is not installed.")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True), encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def iter_log_file(path: str):
+    """Streams the entries of one day's journal without loading the whole file."""
+    try:
+        with open_log_file(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line after a crash
+    except FileNotFoundError:
+        return
+
+def list_log_files() -> list:
+    """
+    Returns (day, path) pairs for every journal, oldest day first. Closed days
+    come from the manifest; only the handful of still-open .jsonl files are
+    discovered by listing the folder.
+    """
+    files = set()
+    for day, info in load_manifest().get("days", {}).items():
+        files.add((day, os.path.join(CHAT_LOG_FOLDER, info["file"])))
+    for path in glob.glob(os.path.join(CHAT_LOG_FOLDER, "rexode_chat_*.jsonl")):
+        match = _LOG_NAME.match(os.path.basename(path))
+        if match:
+            files.add((match.group(1), path))
+    # Within a day, the compressed part holds the older entries
+    return sorted(files, key=lambda f: (f[0], f[1].endswith(".jsonl")))
+
+def list_log_days() -> list:
+    """Returns the dates (YYYY-MM-DD) that have a journal, oldest first."""
+    return sorted({day for day, _ in list_log_files()})
+
+def iter_chats(start_date: str = None, end_date: str = None):
+    """Streams entries across days, optionally limited to an inclusive YYYY-MM-DD range."""
+    for day, path in list_log_files():
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+        yield from iter_log_file(path)
+
+# ========== Manifest & compression ==========
+
+_manifest_lock = threading.Lock()
+_compress_lock = threading.Lock()
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"days": {}}
+
+def _save_manifest(manifest: dict):
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def _compressed_suffix():
+    if COMPRESSION == "none":
+        return None
+    if COMPRESSION == "zstd" and zstandard is not None:
+        return ".zst"
+    return ".gz"
+
+def _compress_day(day: str, suffix: str):
+    """Compresses one closed day's .jsonl and records it in the manifest."""
+    src = get_log_path(day)
+    dst = src + suffix
+    entries, first_ts, last_ts, raw_bytes = 0, None, None, 0
+    # Appending keeps any earlier compressed part valid: gzip members and zstd frames concatenate
+    with open(src, "rb") as f_in, open(dst, "ab") as raw_out:
+        if suffix == ".zst":
+            out = zstandard.ZstdCompressor(level=10).stream_writer(raw_out, closefd=False)
+        else:
+            out = gzip.GzipFile(fileobj=raw_out, mode="wb", compresslevel=6)
+        with out:
+            for line in f_in:
+                out.write(line)
+                raw_bytes += len(line)
+                try:
+                    timestamp = json.loads(line).get("timestamp")
+                except ValueError:
+                    continue
+                entries += 1
+                first_ts = first_ts or timestamp
+                last_ts = timestamp or last_ts
+        raw_out.flush()
+        os.fsync(raw_out.fileno())
+
+    with _manifest_lock:
+        manifest = load_manifest()
+        previous = manifest.setdefault("days", {}).get(day, {})
+        manifest["days"][day] = {
+            "file": os.path.basename(dst),
+            "entries": previous.get("entries", 0) + entries,
+            "first": previous.get("first") or first_ts,
+            "last": last_ts or previous.get("last"),
+            "raw_bytes": previous.get("raw_bytes", 0) + raw_bytes,
+            "bytes": os.path.getsize(dst),
+        }
+        _save_manifest(manifest)
+    os.remove(src)
+
+def compress_closed_days() -> int:
+    """Compresses every .jsonl journal older than today. Returns how many were compressed."""
+    suffix = _compressed_suffix()
+    if suffix is None:
+        return 0
+    today = datetime.now().strftime("%Y-%m-%d")
+    compressed = 0
+    with _compress_lock:
+        for path in sorted(glob.glob(os.path.join(CHAT_LOG_FOLDER, "rexode_chat_*.jsonl"))):
+            match = _LOG_NAME.match(os.path.basename(path))
+            if not match or match.group(1) >= today:
+                continue
+            try:
+                _compress_day(match.group(1), suffix)
+                compressed += 1
+            except Exception as e:
+                print(f"[DEBUG] Could not compress chat log {path}: {e}")
+    return compressed
+
+def compress_closed_days_async():
+    threading.Thread(target=compress_closed_days, name="chat-log-compressor", daemon=True).start()
+
+# ========== Migration ==========
+
+_LEGACY_NAME = re.compile(r"^(?:rexode_chat_)?(\d{4}-\d{2}-\d{2})\.json$")
+
+def _normalize_legacy(entry: dict) -> dict:
+    # utils.log_chat used {"time": str(datetime), ...}
+    if "timestamp" not in entry and "time" in entry:
+        entry = {"timestamp": str(entry["time"])[:19], "user": entry.get("user", ""), "rexode": entry.get("rexode", "")}
+    return entry
+
+def migrate_json_logs() -> int:
+    """
+    One-shot conversion of the old JSON-array logs (rexode_chat_<date>.json
+    from chat_logger and <date>.json from utils.log_chat) into JSONL journals.
+    Both loggers may have written the same day, and a same-day journal may
+    already exist, so each day's entries are merged by timestamp.
+    Returns the number of files migrated.
+    """
+    by_day = {}
+    for json_path in sorted(glob.glob(os.path.join(CHAT_LOG_FOLDER, "*.json"))):
+        match = _LEGACY_NAME.match(os.path.basename(json_path))
+        if not match:
+            continue
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if not isinstance(entries, list):
+            continue
+        by_day.setdefault(match.group(1), []).append((json_path, entries))
+
+    migrated = 0
+    for day, sources in sorted(by_day.items()):
+        entries = [_normalize_legacy(entry) for _, source in sources for entry in source]
+        unreadable = []  # journal lines that aren't JSON are kept, after the rest
+        jsonl_path = get_log_path(day)
+        if os.path.exists(jsonl_path):
+            with open(jsonl_path, "r", encoding="utf-8") as existing:
+                for line in existing:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        if line.strip():
+                            unreadable.append(line if line.endswith("\n") else line + "\n")
+        entries.sort(key=lambda entry: str(entry.get("timestamp") or ""))  # stable: ties keep file order
+
+        tmp_path = jsonl_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for entry in entries:
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            out.writelines(unreadable)
+        _writer.flush()
+        _journal.close()  # don't keep appending to the file being replaced
+        os.replace(tmp_path, jsonl_path)
+        for json_path, _ in sources:
+            os.remove(json_path)
+            migrated += 1
+    return migrated
 
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(log_data, f, indent=2, ensure_ascii=False)
+if __name__ == "__main__":
+    count = migrate_json_logs()
+    print(f"Migrated {count} chat log file(s) to JSONL.")
+    count = compress_closed_days()
+    print(f"Compressed {count} closed day(s).")
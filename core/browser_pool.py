@@ -0,0 +1,152 @@
+import asyncio
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright
+from rich.console import Console
+
+console = Console()
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_PAGE_TIMEOUT = 15.0  # seconds, per page
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+def _site(host: str) -> str:
+    """Rough registrable domain: the last two labels of a hostname."""
+    return ".".join((host or "").lower().split(".")[-2:])
+
+
+def _make_route_filter(url: str):
+    """Builds a route handler that drops heavy assets and third-party scripts for a page."""
+    page_site = _site(urlparse(url).hostname)
+
+    async def handle(route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in BLOCKED_RESOURCE_TYPES or (
+            resource_type == "script" and _site(urlparse(request.url).hostname) != page_site
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    return handle
+
+
+class BrowserPool:
+    """
+    Keeps one headless Chromium alive for the whole session and hands out
+    reusable browser contexts, so pages can be fetched concurrently without
+    paying a browser cold start per link.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, page_timeout: float = DEFAULT_PAGE_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.page_timeout = page_timeout
+        self._playwright = None
+        self._browser = None
+        self._contexts = None  # asyncio.Queue of idle BrowserContexts
+        self._loop = None
+        self._start_lock = None
+        self._open_pages = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        # Playwright objects are bound to the loop that created them; a pool
+        # started on a loop that has since gone away has to be rebuilt.
+        if self._loop is not loop:
+            self._playwright = None
+            self._browser = None
+            self._contexts = None
+            self._open_pages = set()
+            self._start_lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._start_lock:
+            if self.is_running:
+                return
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._contexts = asyncio.Queue()
+            for _ in range(self.max_concurrency):
+                self._contexts.put_nowait(await self._browser.new_context())
+
+    async def fetch(self, url: str, block_resources: bool = False) -> str:
+        """
+        Loads a URL in a pooled context and returns the rendered HTML.
+        With `block_resources`, images, fonts, media and third-party scripts are not loaded.
+        """
+        await self.start()
+        context = await self._contexts.get()
+        page = None
+        try:
+            page = await context.new_page()
+            self._open_pages.add(page)
+            if block_resources:
+                await page.route("**/*", _make_route_filter(url))
+            return await asyncio.wait_for(self._load(page, url), timeout=self.page_timeout)
+        finally:
+            if page is not None:
+                self._open_pages.discard(page)
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self._contexts.put_nowait(context)
+
+    async def _load(self, page, url: str) -> str:
+        timeout_ms = self.page_timeout * 1000
+        await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
+        await page.wait_for_selector("body", timeout=5000)
+        return await page.content()
+
+    async def abort_all(self):
+        """Closes every page still loading, so in-flight navigations fail immediately."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        pages, self._open_pages = list(self._open_pages), set()
+        for page in pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    async def close(self):
+        if self._loop is not asyncio.get_running_loop():
+            # Belongs to a loop that no longer exists; nothing we can await here.
+            self._playwright = self._browser = self._contexts = self._loop = None
+            return
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+        except Exception as e:
+            console.print(f"[dim]Browser pool shutdown error: {e}[/dim]")
+        finally:
+            self._playwright = self._browser = self._contexts = None
+
+
+_pool = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Returns the session-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool():
+    if _pool is not None:
+        await _pool.close()
+
+
+async def abort_browser_navigations():
+    if _pool is not None:
+        await _pool.abort_all()
@@ -0,0 +1,146 @@
+import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from core.browser_pool import get_browser_pool
+
+TIER_STATS_FILE = os.path.join(".rexode", "cache", "fetch_tiers.json")
+HTTP_TIMEOUT = 6.0  # seconds
+MIN_STATIC_TEXT = 400  # visible characters a static page needs to skip the browser
+TIER_RECHECK_AFTER = 7 * 24 * 60 * 60  # seconds; a host on the browser tier is tried over HTTP again after this
+STATS_SAVE_INTERVAL = 30.0  # seconds; learned tiers are written at most this often (and at exit)
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+_SCRIPT_OR_STYLE = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>", re.I | re.S)
+_TAG = re.compile(r"<[^>]+>")
+_JS_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "you need to enable javascript",
+)
+
+
+def needs_javascript(html: str) -> bool:
+    """Heuristic: True when a plain HTTP response looks like an empty client-side app shell."""
+    lowered = html[:20000].lower()
+    if any(marker in lowered for marker in _JS_REQUIRED_MARKERS):
+        return True
+    text = _TAG.sub(" ", _SCRIPT_OR_STYLE.sub(" ", html))
+    return len(" ".join(text.split())) < MIN_STATIC_TEXT
+
+
+class FetchEngine:
+    """
+    Fetches pages with a plain keep-alive HTTP client first and falls back to
+    the Playwright browser pool only when the page needs JavaScript.
+
+    What each host's HTTP responses showed is remembered (and persisted), so
+    hosts that need a browser skip the wasted HTTP attempt, until the verdict
+    is TIER_RECHECK_AFTER old. Only a real page counts as evidence: an error
+    or a blocked request falls back to the browser without teaching anything.
+    The stats file is rewritten at most every STATS_SAVE_INTERVAL, in a
+    worker thread, and once more at exit.
+    """
+
+    def __init__(self, stats_file: str = TIER_STATS_FILE):
+        self.stats_file = stats_file
+        self._host_stats = self._load_stats()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _load_stats(self) -> dict:
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stats(self):
+        """Writes the stats if anything was learned since the last write. Blocking."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._host_stats, indent=2)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+            with open(self.stats_file, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+        except OSError:
+            pass
+
+    async def _maybe_save_stats(self):
+        if self._dirty and time.monotonic() - self._last_save >= STATS_SAVE_INTERVAL:
+            await asyncio.to_thread(self._save_stats)
+
+    def preferred_tier(self, url: str) -> str:
+        stats = self._host_stats.get(urlparse(url).hostname or "", {})
+        if stats.get(TIER_BROWSER, 0) > stats.get(TIER_HTTP, 0) \
+                and time.time() - stats.get("checked", 0) < TIER_RECHECK_AFTER:
+            return TIER_BROWSER
+        return TIER_HTTP
+
+    def _learn(self, url: str, tier: str):
+        """Records that an HTTP response from this host showed `tier` is the one it needs."""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            stats = self._host_stats.setdefault(host, {TIER_HTTP: 0, TIER_BROWSER: 0})
+            stats[tier] = stats.get(tier, 0) + 1
+            stats["checked"] = time.time()
+            self._dirty = True
+
+    def _http_get(self, url: str):
+        """Returns the HTML body, or None when the response can't be used as-is."""
+        response = self._session.get(url, timeout=HTTP_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        if "html" not in response.headers.get("Content-Type", "html"):
+            return None
+        return response.text
+
+    async def fetch(self, url: str) -> str:
+        if self.preferred_tier(url) == TIER_HTTP:
+            try:
+                html = await asyncio.to_thread(self._http_get, url)
+            except requests.RequestException:
+                html = None
+            if html is not None:
+                if not needs_javascript(html):
+                    self._learn(url, TIER_HTTP)
+                    await self._maybe_save_stats()
+                    return html
+                self._learn(url, TIER_BROWSER)
+                await self._maybe_save_stats()
+
+        return await get_browser_pool().fetch(url, block_resources=True)
+
+
+_engine = None
+
+
+def get_fetch_engine() -> FetchEngine:
+    global _engine
+    if _engine is None:
+        _engine = FetchEngine()
+        atexit.register(_engine._save_stats)
+    return _engine
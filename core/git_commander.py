@@ -1,16 +1,22 @@
 import subprocess
 import os
+from core.process_runner import run_process, ProcessCancelled
 from rich.console import Console
 
 console = Console()
+GIT_TIMEOUT = 300  # seconds; clones and pushes can be slow
 
 def run_git_command(command_args: list) -> str:
     """Helper to run git commands and capture output."""
     try:
-        result = subprocess.run(["git"] + command_args, capture_output=True, text=True, check=True)
+        result = run_process(["git"] + command_args, check=True, timeout=GIT_TIMEOUT)
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
         return f"❌ Git command failed: {e.stderr.strip()}"
+    except subprocess.TimeoutExpired:
+        return f"❌ Git command timed out after {GIT_TIMEOUT} seconds and was stopped."
+    except ProcessCancelled:
+        return "Git command cancelled."
     except FileNotFoundError:
         return "❌ Git is not installed or not in your system PATH."
     except Exception as e:
@@ -0,0 +1,168 @@
+import re
+from html.parser import HTMLParser
+
+DEFAULT_MAX_CHARS = 2000
+FEED_CHUNK = 8192
+
+# Subtrees that hold no readable text at all
+NON_TEXT_TAGS = {"head", "title", "script", "style", "noscript", "template", "svg", "canvas", "iframe"}
+# Subtrees whose text is boilerplate (menus, forms...)
+BOILERPLATE_TAGS = {"nav", "aside", "form", "button", "select"}
+# Boilerplate only outside a main region: an article's own <header> holds its title
+PAGE_CHROME_TAGS = {"header", "footer"}
+# Whole id/class tokens that mark boilerplate containers (cookie banners, menus, ads...). Matched
+# token by token, so "content-sidebar-wrap" or "share-price" aren't mistaken for them.
+BOILERPLATE_CLASSES = {
+    "cookie", "cookies", "cookie-banner", "cookie-notice", "cookie-consent", "consent", "gdpr",
+    "banner", "navbar", "nav", "navigation", "menu", "main-menu", "site-nav", "breadcrumb", "breadcrumbs",
+    "footer", "site-footer", "page-footer", "sidebar", "advert", "advertisement", "ad", "ads",
+    "popup", "modal", "newsletter", "share", "sharing", "share-buttons", "social", "social-share",
+}
+MAIN_TAGS = {"main", "article"}
+# Never dropped on id/class hints alone (e.g. <body class="has-sidebar">)
+CONTAINER_TAGS = {"html", "body", "main", "article"}
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dd", "dt", "hr",
+}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+_HAS_MAIN_REGION = re.compile(r"<(?:main|article)\b|role\s*=\s*[\"']?main", re.I)
+
+
+class _BudgetFilled(Exception):
+    pass
+
+
+class _BoundedTextParser(HTMLParser):
+    """
+    Streams text out of HTML, skipping boilerplate subtrees (unless
+    `filtered` is off), and aborts the parse as soon as `max_chars` of useful
+    text have been collected.
+    """
+
+    def __init__(self, max_chars: int, main_only: bool, filtered: bool = True):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.main_only = main_only
+        self.filtered = filtered
+        self.parts = []
+        self.length = 0
+        self._check_at = max_chars
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._main_tag = None
+        self._main_depth = 0
+        self._suspended_skip = None  # a boilerplate skip set aside while a main region inside it is read
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag in BLOCK_TAGS and not self._skip_tag:
+                self.parts.append(" ")
+            return
+        attrs = dict(attrs)
+        if self._skip_tag:
+            if self._skip_tag not in NON_TEXT_TAGS and not self._main_tag and self._is_main(tag, attrs):
+                # A main region is never boilerplate, whatever wraps it: read it, then resume skipping
+                self._suspended_skip = (self._skip_tag, self._skip_depth)
+                self._skip_tag = None
+            else:
+                if tag == self._skip_tag:
+                    self._skip_depth += 1
+                return
+
+        if tag in NON_TEXT_TAGS or (self.filtered and self._is_boilerplate(tag, attrs)) \
+                or (self.filtered and tag in PAGE_CHROME_TAGS and not self._main_tag):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+
+        if self._main_tag:
+            if tag == self._main_tag:
+                self._main_depth += 1
+        elif self._is_main(tag, attrs):
+            self._main_tag, self._main_depth = tag, 1
+
+        if tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if self._main_tag and tag == self._main_tag:
+            self._main_depth -= 1
+            if self._main_depth == 0:
+                self._main_tag = None
+                if self._suspended_skip:
+                    self._skip_tag, self._skip_depth = self._suspended_skip
+                    self._suspended_skip = None
+        if tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if self._skip_tag or (self.main_only and not self._main_tag):
+            return
+        self.parts.append(data)
+        self.length += len(data)
+        # Raw length over-counts whitespace, so confirm against the normalized text
+        # and, if it's still short, don't look again until enough new data arrived
+        if self.length >= self._check_at:
+            missing = self.max_chars - len(self.text())
+            if missing <= 0:
+                raise _BudgetFilled
+            self._check_at = self.length + missing
+
+    @staticmethod
+    def _is_main(tag: str, attrs: dict) -> bool:
+        return tag in MAIN_TAGS or attrs.get("role") == "main"
+
+    @staticmethod
+    def _is_boilerplate(tag: str, attrs: dict) -> bool:
+        if tag in BOILERPLATE_TAGS or attrs.get("aria-hidden") == "true" \
+                or attrs.get("role") in ("navigation", "banner", "contentinfo"):
+            return True
+        if tag in CONTAINER_TAGS:
+            return False
+        tokens = f"{attrs.get('id') or ''} {attrs.get('class') or ''}".lower().split()
+        return any(token in BOILERPLATE_CLASSES for token in tokens)
+
+    def text(self) -> str:
+        return " ".join("".join(self.parts).split())
+
+
+def _run(html: str, max_chars: int, main_only: bool, filtered: bool = True) -> str:
+    parser = _BoundedTextParser(max_chars, main_only, filtered)
+    try:
+        for start in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[start:start + FEED_CHUNK])
+        parser.close()
+    except _BudgetFilled:
+        pass
+    except Exception:
+        # HTMLParser is lenient, but never let a bad page take the tool down
+        pass
+    return parser.text()[:max_chars].rstrip()
+
+
+def extract_text(html: str, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """
+    Returns up to `max_chars` of readable text from an HTML document.
+
+    Text inside <main>/<article>/role="main" is preferred when the page has
+    such a region; navigation, footers, cookie banners and similar boilerplate
+    are dropped. Parsing stops as soon as the budget is filled. If filtering
+    leaves nothing, the page's text is returned unfiltered.
+    """
+    if not html:
+        return ""
+    if _HAS_MAIN_REGION.search(html):
+        text = _run(html, max_chars, main_only=True)
+        # A near-empty main region usually means a mislabeled wrapper; use the whole page
+        if len(text) >= min(max_chars, 200):
+            return text
+    return _run(html, max_chars, main_only=False) or _run(html, max_chars, main_only=False, filtered=False)
@@ -1,7 +1,9 @@
 import subprocess
+from core.process_runner import run_process, ProcessCancelled
 from rich.console import Console
 
 console = Console()
+COMMAND_TIMEOUT = 300  # seconds
 
 def execute_nl_command(command: str, confirm: bool = True):
     """
@@ -32,7 +34,7 @@ def execute_nl_command(command: str, confirm: bool = True):
         # Use powershell for better compatibility on Windows, especially for chained commands
         # Using -Command "& { ... }" ensures proper parsing of complex commands
         powershell_command = f"& {{ {command} }}"
-        result = subprocess.run(["powershell", "-Command", powershell_command], capture_output=True, text=True, check=True, shell=True)
+        result = run_process(["powershell", "-Command", powershell_command], check=True, shell=True, timeout=COMMAND_TIMEOUT)
         
         output_str = ""
         if result.stdout:
@@ -57,6 +59,14 @@ def execute_nl_command(command: str, confirm: bool = True):
             error_message += f"[bold red]Errors:[/bold red]\n{e.stderr}"
         console.print(error_message)
         return error_message
+    except subprocess.TimeoutExpired:
+        error_message = f"Command timed out after {COMMAND_TIMEOUT} seconds and was stopped."
+        console.print(error_message, style="bold red")
+        return error_message
+    except ProcessCancelled:
+        error_message = "Command cancelled."
+        console.print(error_message, style="bold yellow")
+        return error_message
     except FileNotFoundError:
         error_message = "'powershell' command not found. Please ensure PowerShell is installed and in your PATH."
         console.print(error_message, style="bold red")
@@ -1,6 +1,7 @@
 import os
 import subprocess
 import pyautogui
+from core.process_runner import run_process, ProcessCancelled
 from rich.console import Console
 
 console = Console()
@@ -74,7 +75,7 @@ def schedule_shutdown(minutes: str):
 
         # The /t flag specifies the time-out period in seconds.
         command = ['shutdown', '/s', '/t', str(seconds)]
-        subprocess.run(command, check=True, capture_output=True, text=True)
+        run_process(command, check=True)
         
         message = f"System shutdown scheduled in {minutes} minute(s)."
         console.print(f"[bold green]{message}[/bold green]")
@@ -88,6 +89,9 @@ def schedule_shutdown(minutes: str):
         error_message = f"Error scheduling shutdown: {e.stderr}"
         console.print(f"[bold red]{error_message}[/bold red]")
         return error_message
+    except ProcessCancelled:
+        console.print("Shutdown cancelled.", style="bold yellow")
+        return "Shutdown cancelled."
     except Exception as e:
         error_message = f"An unexpected error occurred: {e}"
         console.print(f"[bold red]{error_message}[/bold red]")
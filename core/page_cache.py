@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.path.join(".rexode", "cache", "pages")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+PAGE_TTL = 6 * 60 * 60       # rendered page text
+QUERY_TTL = 60 * 60          # search engine result lists
+NEGATIVE_TTL = 5 * 60        # failed fetches, retried after this
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def normalize_url(url: str) -> str:
+    return url.strip().split("#", 1)[0]
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache for web tools.
+
+    Each entry lives in its own JSON file named after the SHA-256 of its
+    namespace and key. Entries carry their own expiry, and the file mtime is
+    bumped on every hit so eviction can drop the least recently used files
+    once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None  # computed lazily on the first write
+
+    def _path(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha256(f"{namespace}\0{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.json")
+
+    def get(self, namespace: str, key: str):
+        """
+        Returns the cached entry dict ({"value": ...} or {"error": ...}) or None
+        when there is no live entry.
+        """
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if entry.get("expires", 0) < time.time():
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, None)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, namespace: str, key: str, value, ttl: float):
+        self._write(namespace, key, {"value": value}, ttl)
+
+    def put_error(self, namespace: str, key: str, error: str, ttl: float = NEGATIVE_TTL):
+        self._write(namespace, key, {"error": error}, ttl)
+
+    def _write(self, namespace: str, key: str, entry: dict, ttl: float):
+        entry.update({"key": key, "namespace": namespace, "expires": time.time() + ttl})
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        path = self._path(namespace, key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                return
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: str):
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            if self._size is not None:
+                self._size -= size
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".json"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, st.st_mtime, st.st_size
+
+    def _scan_size(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self):
+        """Deletes least recently used entries until the cache is at 90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        for path, _, size in sorted(self._entries(), key=lambda e: e[1]):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    # Convenience helpers for the web tools
+
+    def get_page(self, url: str):
+        return self.get("page", normalize_url(url))
+
+    def put_page(self, url: str, content: str, ttl: float = PAGE_TTL):
+        self.put("page", normalize_url(url), content, ttl)
+
+    def put_page_error(self, url: str, error: str, ttl: float = NEGATIVE_TTL):
+        self.put_error("page", normalize_url(url), error, ttl)
+
+    def get_query(self, engine: str, query: str, max_results: int):
+        return self.get(engine, f"{max_results}:{normalize_query(query)}")
+
+    def put_query(self, engine: str, query: str, max_results: int, results: list, ttl: float = QUERY_TTL):
+        self.put(engine, f"{max_results}:{normalize_query(query)}", results, ttl)
+
+
+_cache = None
+
+
+def get_page_cache() -> PageCache:
+    global _cache
+    if _cache is None:
+        _cache = PageCache()
+    return _cache
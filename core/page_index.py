@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+INDEX_PATH = os.path.join(".rexode", "cache", "page_index.db")
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # indexed text, not file size
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_hash ON pages(content_hash);
+CREATE INDEX IF NOT EXISTS pages_fetched_at ON pages(fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, content, tokenize='porter unicode61');
+"""
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(text: str, operator: str = " ") -> str:
+    """Turns free text into a safe FTS5 query of quoted terms (implicit AND by default)."""
+    return operator.join(f'"{word}"' for word in _WORD.findall(text))
+
+
+class PageIndex:
+    """
+    Local SQLite FTS5 index of the text of every page the web tools fetched,
+    so repeat research can be answered without touching the network.
+    """
+
+    def __init__(self, path: str = INDEX_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def add(self, url: str, title: str, content: str) -> bool:
+        """
+        Indexes a page. Returns False when nothing new was stored: the URL
+        already holds this exact text, or another URL has the same text.
+        """
+        if not content:
+            return False
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id, content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+            if row and row[1] == content_hash:
+                self._conn.execute("UPDATE pages SET fetched_at = ? WHERE id = ?", (now, row[0]))
+                return False
+            if not row and self._conn.execute(
+                "SELECT 1 FROM pages WHERE content_hash = ?", (content_hash,)
+            ).fetchone():
+                return False  # mirror or duplicate of a page we already have
+            if row:
+                self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (row[0],))
+                self._conn.execute(
+                    "UPDATE pages SET title = ?, content_hash = ?, fetched_at = ?, size = ? WHERE id = ?",
+                    (title, content_hash, now, len(content), row[0]),
+                )
+                page_id = row[0]
+            else:
+                page_id = self._conn.execute(
+                    "INSERT INTO pages (url, title, content_hash, fetched_at, size) VALUES (?, ?, ?, ?, ?)",
+                    (url, title, content_hash, now, len(content)),
+                ).lastrowid
+            self._conn.execute(
+                "INSERT INTO pages_fts (rowid, title, content) VALUES (?, ?, ?)", (page_id, title, content)
+            )
+            self._prune()
+        return True
+
+    def _prune(self):
+        """Drops the oldest pages until the indexed text fits in `max_bytes`."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for page_id, size in self._conn.execute("SELECT id, size FROM pages ORDER BY fetched_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (page_id,))
+            self._conn.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+            total -= size
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Returns the best matching pages as dicts with url, title, fetched_at and a snippet."""
+        results = []
+        for fts_query in (_fts_query(query), _fts_query(query, " OR ")):
+            if not fts_query:
+                return []
+            with self._lock:
+                rows = self._conn.execute(
+                    """
+                    SELECT p.url, p.title, p.fetched_at, snippet(pages_fts, 1, '', '', ' … ', 40)
+                    FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid
+                    WHERE pages_fts MATCH ?
+                    ORDER BY rank LIMIT ?
+                    """,
+                    (fts_query, limit),
+                ).fetchall()
+            if rows:
+                results = [
+                    {"url": url, "title": title, "fetched_at": fetched_at, "snippet": snippet}
+                    for url, title, fetched_at, snippet in rows
+                ]
+                break
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {"pages": count, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+
+
+def get_page_index() -> PageIndex:
+    global _index
+    if _index is None:
+        _index = PageIndex()
+    return _index
+
+
+def search_fetched_pages(query: str) -> str:
+    """Searches the text of previously fetched web pages without going to the network."""
+    try:
+        results = get_page_index().search(query)
+    except Exception as e:
+        return f"❌ Error searching fetched pages: {e}"
+    if not results:
+        return "No previously fetched pages match this query."
+    return "\n\n".join(
+        f"{r['title']}\n{r['url']}\n(fetched {datetime.fromtimestamp(r['fetched_at']).strftime('%Y-%m-%d %H:%M')})\n{r['snippet']}"
+        for r in results
+    )
@@ -0,0 +1,117 @@
+import os
+import signal
+import subprocess
+import threading
+
+KILL_GRACE = 0.5  # seconds between SIGTERM and SIGKILL
+
+
+class ProcessCancelled(Exception):
+    """Raised by run_process when the process was killed by a cancel or tool deadline."""
+
+
+_live = {}  # Popen -> id of the thread that started it
+_live_lock = threading.Lock()
+_cancelled = set()
+_stopped_threads = set()  # threads whose tool was cancelled or timed out; they may not start new processes
+
+
+def _kill_tree(proc: subprocess.Popen):
+    """Kills a child and everything it spawned (its whole process group)."""
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.Popen(["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # start_new_session=True made the child a group leader, so pgid == pid
+            os.killpg(proc.pid, signal.SIGTERM)
+
+            def force_kill():
+                if proc.poll() is None:
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+            threading.Timer(KILL_GRACE, force_kill).start()
+    except OSError:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+
+def kill_processes(thread_id: int = None) -> int:
+    """
+    Kills running child processes started through run_process: all of them, or
+    only those started from `thread_id`. Returns how many were signalled.
+    """
+    with _live_lock:
+        targets = [p for p, owner in _live.items() if thread_id is None or owner == thread_id]
+        _cancelled.update(targets)
+    for proc in targets:
+        _kill_tree(proc)
+    return len(targets)
+
+
+def stop_thread(thread_id: int) -> int:
+    """
+    Kills the processes started from `thread_id` and refuses any new ones it
+    tries to start until resume_thread(), so a tool that carries on after its
+    cancel (e.g. once a confirmation prompt returns) can't launch its command.
+    """
+    with _live_lock:
+        _stopped_threads.add(thread_id)
+    return kill_processes(thread_id)
+
+
+def thread_stopped() -> bool:
+    """True when the calling thread's tool was cancelled; checked after a confirmation prompt returns."""
+    with _live_lock:
+        return threading.get_ident() in _stopped_threads
+
+
+def resume_thread(thread_id: int = None):
+    with _live_lock:
+        _stopped_threads.discard(threading.get_ident() if thread_id is None else thread_id)
+
+
+def run_process(args, shell: bool = False, check: bool = False, timeout: float = None,
+                input: str = None) -> subprocess.CompletedProcess:
+    """
+    Drop-in for subprocess.run(args, capture_output=True, text=True, ...) whose
+    child runs in its own process group, so a timeout or kill_processes()
+    takes down the whole tree instead of leaving orphans behind.
+    """
+    popen_kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE, "text": True, "shell": shell}
+    if input is not None:
+        popen_kwargs["stdin"] = subprocess.PIPE
+    if os.name == "nt":
+        popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        popen_kwargs["start_new_session"] = True
+
+    with _live_lock:
+        if threading.get_ident() in _stopped_threads:
+            raise ProcessCancelled(f"Process not started, its tool was cancelled: {args}")
+        proc = subprocess.Popen(args, **popen_kwargs)
+        _live[proc] = threading.get_ident()
+    try:
+        try:
+            stdout, stderr = proc.communicate(input, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_tree(proc)
+            stdout, stderr = proc.communicate()
+            raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+    finally:
+        with _live_lock:
+            _live.pop(proc, None)
+            cancelled = proc in _cancelled
+            _cancelled.discard(proc)
+
+    if cancelled:
+        raise ProcessCancelled(f"Process cancelled: {args}")
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
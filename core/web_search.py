@@ -0,0 +1,97 @@
+import asyncio
+from duckduckgo_search import DDGS
+from core.fetch_engine import get_fetch_engine
+from core.html_extractor import extract_text
+from core.page_cache import get_page_cache
+from core.page_index import get_page_index
+
+def _ddgs_text(query: str, max_results: int) -> list:
+    """Runs a DDGS text search, serving repeated queries from the page cache."""
+    cache = get_page_cache()
+    cached = cache.get_query("ddgs", query, max_results)
+    if cached is not None and "value" in cached:
+        return cached["value"]
+    with DDGS() as ddgs:
+        results = [{"title": r['title'], "href": r['href']} for r in ddgs.text(query, max_results=max_results)]
+    cache.put_query("ddgs", query, max_results, results)
+    return results
+
+async def _load_result(result: dict) -> dict:
+    """Fills in result['content'] by fetching its link: plain HTTP first, the browser pool only if needed."""
+    cache = get_page_cache()
+    try:
+        html = await get_fetch_engine().fetch(result['link'])
+    except Exception as e:
+        print(f"[DEBUG] HeadlessSearch Error fetching content for {result.get('link', 'unknown')}: {e!r}")
+        result['content'] = f"Could not fetch content: {e!r}"
+        cache.put_page_error(result['link'], repr(e))
+        return result
+    try:
+        result['content'] = extract_text(html, max_chars=2000) # Limit content length
+        if not result['content']:
+            # Nothing readable (a blocked or script-only page): retry it later, don't keep it as a good page
+            result['content'] = "Could not fetch content: no readable text on the page"
+            cache.put_page_error(result['link'], "no readable text on the page")
+            return result
+        cache.put_page(result['link'], result['content'])
+        get_page_index().add(result['link'], result.get('title', ''), result['content'])
+    except Exception as e:
+        print(f"[DEBUG] HeadlessSearch Error parsing content for {result.get('link', 'unknown')}: {e}")
+        result['content'] = f"Could not fetch content: {e}"
+        cache.put_page_error(result['link'], str(e))
+    return result
+
+async def headless_search_stream(query: str, num_results: int = 5):
+    """
+    Async generator version of headless_search: yields each {title, link, content}
+    result as soon as its page is ready, fastest first. Raises if the search itself fails.
+    """
+    print(f"[DEBUG] HeadlessSearch: Querying for '{query}' using DDGS API.")
+    api_results = await asyncio.to_thread(_ddgs_text, query, num_results)
+    results = [{"title": r['title'], "link": r['href']} for r in api_results]
+
+    # Serve pages fetched recently (or failed recently) from the cache
+    cache = get_page_cache()
+    to_fetch = []
+    for result in results:
+        cached = cache.get_page(result['link'])
+        if cached is None:
+            to_fetch.append(result)
+            continue
+        if "error" in cached:
+            result['content'] = f"Could not fetch content: {cached['error']}"
+        else:
+            result['content'] = cached['value']
+        yield result
+
+    # Fetch the remaining links concurrently and hand each one out as it finishes
+    tasks = [asyncio.create_task(_load_result(result)) for result in to_fetch]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def headless_search(query: str, num_results: int = 5):
+    """
+    Performs a web search using a headless browser and returns the top results.
+    """
+    results = []
+    try:
+        async for result in headless_search_stream(query, num_results):
+            results.append(result)
+    except Exception as e:
+        print(f"[DEBUG] HeadlessSearch Error during DDGS API search: {e}")
+        return f"An error occurred during web search: {e}"
+
+    print(f"[DEBUG] HeadlessSearch returning {len(results)} results.")
+    return results
+
+def search_web(query: str) -> str:
+    """Searches the web using DuckDuckGo and returns the top 3 results."""
+    try:
+        results = _ddgs_text(query, 3)
+        return "\n\n".join([f"{r['title']}\n{r['href']}" for r in results])
+    except Exception as e:
+        return f"Web search error: {str(e)}"
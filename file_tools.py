@@ -1,6 +1,7 @@
 import os
 import shutil
 import zipfile
+from core.process_runner import thread_stopped
 
 def read_file(path: str) -> str:
     try:
@@ -89,10 +90,14 @@ def create_directory(path: str) -> str:
     except Exception as e:
         return f"❌ Error creating directory: {str(e)}"
 
-def delete_directory(path: str) -> str:
+def delete_directory(path: str, confirm: bool = False) -> str:
     try:
         if not os.path.exists(path):
             return "⚠️ Directory not found."
+        if confirm and input(f"Delete directory '{path}' and everything in it? (y/n): ").strip().lower() != "y":
+            return "Deletion cancelled."
+        if thread_stopped():
+            return "Deletion cancelled."  # cancelled while the prompt was open
         shutil.rmtree(path)
         return f"✅ Deleted directory: {path}"
     except Exception as e:
@@ -39,7 +39,8 @@ class InlineActivityIndicator:
 
     def _animate(self):
         self._start_time = time.time()
-        with Live(self._get_display_text(), console=self.console, screen=False, refresh_per_second=10) as live:
+        # Transient: the line (and any streamed preview) is cleared once the final answer is printed
+        with Live(self._get_display_text(), console=self.console, screen=False, refresh_per_second=10, transient=True) as live:
             self._live_display = live
             while not self._stop_event.is_set():
                 live.update(self._get_display_text())
@@ -56,6 +57,10 @@ class InlineActivityIndicator:
         self._thread = threading.Thread(target=self._animate, daemon=True)
         self._thread.start()
 
+    def set_message(self, message: str):
+        """Changes the status text shown next to the dots while the indicator runs."""
+        self.message = message
+
     def update_message(self, new_content: str):
         self._current_stream_content += new_content
         if self._live_display:
@@ -0,0 +1,72 @@
+# intent_router.py
+
+import os
+import re
+import statistics
+
+# (tool name, pattern, tool input). Patterns are anchored and narrow on purpose: anything
+# they don't match exactly goes to the agent, so a miss only costs the usual LLM round trip.
+# The tool input is a fixed string or the name of the pattern group holding it. Paths starting
+# with "-" or "/" are left to the agent: "ls -la" is an option, not a folder called "-la".
+INTENTS = [
+    ("GetTime", r"(what(?:'s| is)? )?(the )?(current )?(time|date)( and (time|date))?( is it)?( now| today| right now)?", ""),
+    ("GetTime", r"what (day|date) is (it|today)( today)?", ""),
+    ("ListDir", r"(ls|dir|list( all)? (the )?files|(list|show)( me)?( all)? (the )?(files|contents) (in|of) (this|the current|current) (folder|directory|dir))", "."),
+    ("ListDir", r"(ls|dir|(list|show)( me)?( all)? (the )?(files|contents) (in|of)( folder| directory)?) (?P<path>[^\s/-][^\s]*)", "path"),
+    ("ReadFile", r"(cat|read|show|open)( me)?( the)?( file)? (?P<path>[^\s]+\.[a-z0-9]{1,8})", "path"),
+    ("GitStatus", r"(git status|(what(?:'s| is) the )?(git|repo|repository) status)", ""),
+    ("ListRunningApplications", r"(list|show)( me)?( the| all)? running (apps|applications|programs|processes)", ""),
+    ("SwitchMode", r"(switch|change)( to)? (?P<mode>power|eco|balanced)( mode)?", "mode"),
+    ("AbortShutdown", r"(cancel|abort|stop) (the )?shutdown", ""),
+]
+TRAILING_PUNCTUATION = " ?.!"
+
+
+class IntentRouter:
+    """
+    Answers trivial requests ("what time is it", "list this folder") by calling
+    the matching tool directly, skipping the LLM. Keeps hit counts and latencies
+    for both paths so the saving can be checked with /fastpath.
+    """
+
+    def __init__(self, tool_names, intents=INTENTS):
+        self.enabled = os.environ.get("REXODE_FAST_PATH", "on").lower() not in ("0", "off", "false", "no")
+        self.intents = [(tool, re.compile(pattern, re.IGNORECASE), arg)
+                        for tool, pattern, arg in intents if tool in tool_names]
+        self.fast_times = []
+        self.agent_times = []
+
+    def match(self, text: str):
+        """(tool name, tool input) when the text is unambiguously one tool call, else None."""
+        if not self.enabled:
+            return None
+        text = text.strip().rstrip(TRAILING_PUNCTUATION)
+        for tool, pattern, arg in self.intents:
+            m = pattern.fullmatch(text)
+            if m is None:
+                continue
+            tool_input = m.group(arg) if arg in pattern.groupindex else arg
+            if tool == "ReadFile" and not os.path.isfile(tool_input):
+                continue  # "show main.py" only counts when main.py is really there
+            if tool == "ListDir" and not os.path.isdir(tool_input):
+                continue  # nor "list files in docs" unless docs is a folder
+            return tool, tool_input
+        return None
+
+    def record(self, seconds: float, fast: bool):
+        (self.fast_times if fast else self.agent_times).append(seconds)
+
+    def stats(self) -> dict:
+        turns = len(self.fast_times) + len(self.agent_times)
+
+        def median_ms(times):
+            return f"{statistics.median(times) * 1000:.0f} ms" if times else "n/a"
+
+        return {
+            "enabled": self.enabled,
+            "fast path turns": len(self.fast_times),
+            "agent turns": len(self.agent_times),
+            "hit rate": f"{len(self.fast_times) / turns:.0%}" if turns else "n/a",
+            "median fast path": median_ms(self.fast_times),
+            "median agent": median_ms(self.agent_times),
+        }
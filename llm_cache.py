@@ -0,0 +1,145 @@
+# llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from langchain.load.dump import dumps
+from langchain.load.load import loads
+from langchain.schema.cache import BaseCache
+
+CACHE_PATH = os.path.join(".rexode", "cache", "llm_cache.db")
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT,
+    model TEXT,
+    temperature REAL,
+    prompt_hash TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+"""
+
+
+class LLMResponseCache(BaseCache):
+    """
+    SQLite-backed LangChain cache for one LLM instance, keyed by provider,
+    model, temperature, the model's full parameter string and the prompt hash.
+    Entries expire after `ttl` seconds; once stored responses exceed
+    `max_bytes` the least recently used ones are evicted.
+    """
+
+    def __init__(self, provider: str, model: str, temperature, path: str = CACHE_PATH,
+                 ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = os.environ.get("REXODE_LLM_CACHE", "on").lower() not in ("0", "off", "false", "no")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def _key(self, prompt: str, llm_string: str):
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        key = hashlib.sha256(
+            f"{self.provider}\0{self.model}\0{self.temperature}\0{llm_string}\0{prompt_hash}".encode("utf-8")
+        ).hexdigest()
+        return key, prompt_hash
+
+    def lookup(self, prompt: str, llm_string: str):
+        if not self.enabled:
+            return None
+        key, _ = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        try:
+            generations = [loads(item) for item in json.loads(row[0])]
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if not self.enabled:
+            return
+        key, prompt_hash = self._key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, provider, model, temperature, prompt_hash, value, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, self.provider, self.model, self.temperature, prompt_hash, value, len(value), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self, **kwargs) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{self.hits / lookups:.0%}" if lookups else "n/a",
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+def enable_llm_cache(llm, model_name: str):
+    """
+    Attaches a persistent response cache to the LLM returned by
+    llm_handler.get_llm. Every llm.invoke and every agent step goes through
+    LangChain's cache hook, so nothing else has to change. Returns the cache.
+    """
+    if llm is None:
+        return None
+    provider = getattr(llm, "_llm_type", type(llm).__name__)
+    temperature = getattr(llm, "temperature", None)
+    cache = LLMResponseCache(provider, model_name, temperature)
+    llm.cache = cache
+    return cache
@@ -1,48 +1,124 @@
+import json
+import os
 from getpass import getpass
 from langchain_community.chat_models import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.llms import Ollama
 
-def get_llm():
-    print("\nChoose LLM type: (1) Local LLM, (2) Online API Key, or (3) Local Tools (No LLM):", end=" ")
-    choice = input().strip()
-    model_name = ""
-    llm = None
-
-    if choice == "1":
-        model_name = input("Enter local model name (e.g., llama2, mistral): ").strip()
-        llm = Ollama(model=model_name)
-
-    elif choice == "2":
-        provider = input("Enter online LLM provider (e.g., openai, google, openrouter, groq): ").strip().lower()
-        model_name = input("Enter model name (e.g., gpt-4, gemini-1.5-pro): ").strip()
-        key = getpass("Enter API key (will be hidden): ")
-
-        if provider == "openai":
-            llm = ChatOpenAI(model_name=model_name, openai_api_key=key)
-        elif provider == "google":
-            llm = ChatGoogleGenerativeAI(model=model_name, google_api_key=key)
-        elif provider in ["openrouter", "anthropic", "meta-llama", "mistral", "llama3", "claude"]:
-            llm = ChatOpenAI(
-                model_name=model_name,
-                openai_api_key=key,
-                openai_api_base="https://openrouter.ai/api/v1"
-            )
-        elif provider == "groq":
-            llm = ChatOpenAI(
-                model_name=model_name,
-                openai_api_key=key,
-                openai_api_base="https://api.groq.com/openai/v1"
-            )
+try:
+    from dotenv import load_dotenv
+except ImportError:  # python-dotenv is optional; plain environment variables still work
+    load_dotenv = None
+
+RC_FILE = ".rexoderc"
+OPENROUTER_PROVIDERS = ["openrouter", "anthropic", "meta-llama", "mistral", "llama3", "claude"]
+# Environment variables checked, in order, for each provider's API key
+API_KEY_ENV = {
+    "openai": ["OPENAI_API_KEY"],
+    "google": ["GOOGLE_API_KEY", "GEMINI_API_KEY"],
+    "openrouter": ["OPENROUTER_API_KEY"],
+    "groq": ["GROQ_API_KEY"],
+}
+
+
+def load_llm_config() -> dict:
+    """
+    Provider and model from the environment (REXODE_LLM_PROVIDER,
+    REXODE_LLM_MODEL, also read from .env) or the "llm" section of .rexoderc.
+    Environment wins. Missing values are asked for interactively by get_llm,
+    unless it is told not to prompt.
+    """
+    if load_dotenv is not None:
+        load_dotenv()
+    config = {}
+    try:
+        with open(RC_FILE, "r", encoding="utf-8") as f:
+            config = json.load(f).get("llm") or {}
+    except (OSError, ValueError):
+        pass
+    provider = os.environ.get("REXODE_LLM_PROVIDER") or config.get("provider") or ""
+    model = os.environ.get("REXODE_LLM_MODEL") or config.get("model") or ""
+    return {"provider": provider.strip().lower(), "model": model.strip()}
+
+
+def get_api_key(provider: str, interactive: bool = True) -> str:
+    """The provider's API key from its environment variable; asked for when unset (RuntimeError if not interactive)."""
+    key_group = "openrouter" if provider in OPENROUTER_PROVIDERS else provider
+    names = API_KEY_ENV.get(key_group, [])
+    for name in names:
+        if os.environ.get(name):
+            return os.environ[name]
+    if not interactive:
+        raise RuntimeError(f"Set {' or '.join(names) or 'the API key variable'} for the {provider} provider.")
+    return getpass("Enter API key (will be hidden): ")
+
+
+def build_llm(provider: str, model_name: str, interactive: bool = True):
+    """Creates the LangChain LLM for a provider ("ollama" for a local model)."""
+    if provider in ("ollama", "local"):
+        return Ollama(model=model_name)
+    if provider not in API_KEY_ENV and provider not in OPENROUTER_PROVIDERS:
+        if not interactive:
+            raise RuntimeError(f"Unsupported LLM provider {provider!r} in REXODE_LLM_PROVIDER.")
+        print("❌ Unsupported provider.")
+        exit(1)
+
+    key = get_api_key(provider, interactive)
+    if provider == "openai":
+        return ChatOpenAI(model_name=model_name, openai_api_key=key, streaming=True)
+    elif provider == "google":
+        return ChatGoogleGenerativeAI(model=model_name, google_api_key=key)
+    elif provider in OPENROUTER_PROVIDERS:
+        return ChatOpenAI(
+            model_name=model_name,
+            openai_api_key=key,
+            openai_api_base="https://openrouter.ai/api/v1",
+            streaming=True
+        )
+    elif provider == "groq":
+        return ChatOpenAI(
+            model_name=model_name,
+            openai_api_key=key,
+            openai_api_base="https://api.groq.com/openai/v1",
+            streaming=True
+        )
+    print("❌ Unsupported provider.")
+    exit(1)
+
+
+def get_llm(interactive: bool = True):
+    """
+    (llm, model_name), or (None, "local_tools"). With interactive=False nothing
+    is prompted for: a missing setting raises RuntimeError naming its variable.
+    """
+    config = load_llm_config()
+    provider, model_name = config["provider"], config["model"]
+
+    if provider == "local_tools":
+        return None, "local_tools"
+
+    if not interactive and not provider:
+        raise RuntimeError("Set REXODE_LLM_PROVIDER (or \"provider\" in the \"llm\" section of .rexoderc).")
+    if not interactive and not model_name:
+        raise RuntimeError("Set REXODE_LLM_MODEL (or \"model\" in the \"llm\" section of .rexoderc).")
+
+    if not provider:
+        print("\nChoose LLM type: (1) Local LLM, (2) Online API Key, or (3) Local Tools (No LLM):", end=" ")
+        choice = input().strip()
+        if choice == "1":
+            provider = "ollama"
+        elif choice == "2":
+            provider = input("Enter online LLM provider (e.g., openai, google, openrouter, groq): ").strip().lower()
+        elif choice == "3":
+            return None, "local_tools"
         else:
-            print("❌ Unsupported provider.")
+            print("❌ Invalid choice.")
             exit(1)
-            
-    elif choice == "3":
-        return None, "local_tools"
-        
-    else:
-        print("❌ Invalid choice.")
-        exit(1)
-        
-    return llm, model_name
+
+    if not model_name:
+        if provider in ("ollama", "local"):
+            model_name = input("Enter local model name (e.g., llama2, mistral): ").strip()
+        else:
+            model_name = input("Enter model name (e.g., gpt-4, gemini-1.5-pro): ").strip()
+
+    return build_llm(provider, model_name, interactive), model_name
@@ -0,0 +1,97 @@
+# llm_warmup.py
+
+import importlib.util
+import threading
+import time
+import requests
+
+OLLAMA_KEEP_ALIVE = "30m"  # how long Ollama keeps the model in memory after each request
+OLLAMA_DEFAULT_URL = "http://localhost:11434"
+PRELOAD_TIMEOUT = 300  # seconds; big local models can take minutes to load from disk
+
+
+def is_ollama(llm) -> bool:
+    return type(llm).__name__ in ("Ollama", "ChatOllama")
+
+
+class LLMWarmup:
+    """
+    Does the first turn's one-off work in a background thread while the user
+    types their first prompt: loads a local Ollama model into memory (and keeps
+    it there), opens the provider's HTTP connection and loads the tokenizer
+    when one is installed, then builds the agent. The first turn only waits for
+    whatever is left. Nothing is printed from the background thread; failed
+    steps show up in report().
+    """
+
+    def __init__(self, llm, build_agent=None):
+        self.llm = llm
+        self.build_agent = build_agent
+        self.steps = []  # (name, seconds, error or None)
+        self.agent = None
+        self.waited = 0.0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="llm-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def _step(self, name: str, func):
+        start = time.perf_counter()
+        error = None
+        try:
+            return func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            self.steps.append((name, time.perf_counter() - start, error))
+
+    def _run(self):
+        if is_ollama(self.llm):
+            self._step("model load", self._preload_ollama)
+        else:
+            self._step("provider connection", self._open_connection)
+        if self._tokenizer_installed():
+            self._step("tokenizer", lambda: self.llm.get_num_tokens("warm up"))
+        if self.build_agent is not None:
+            self.agent = self._step("agent", self.build_agent)
+
+    def _tokenizer_installed(self) -> bool:
+        # ChatOpenAI counts tokens with tiktoken; LangChain's default (Ollama, Gemini...) needs transformers
+        module = "tiktoken" if type(self.llm).__name__ == "ChatOpenAI" else "transformers"
+        return importlib.util.find_spec(module) is not None
+
+    def _preload_ollama(self):
+        # An empty prompt makes Ollama load the model without generating anything
+        if hasattr(self.llm, "keep_alive") and self.llm.keep_alive is None:
+            self.llm.keep_alive = OLLAMA_KEEP_ALIVE
+        base_url = getattr(self.llm, "base_url", None) or OLLAMA_DEFAULT_URL
+        response = requests.post(
+            f"{base_url.rstrip('/')}/api/generate",
+            json={"model": self.llm.model, "keep_alive": OLLAMA_KEEP_ALIVE},
+            timeout=PRELOAD_TIMEOUT,
+        )
+        response.raise_for_status()
+
+    def _open_connection(self):
+        # openai>=1 clients: llm.client is the chat.completions resource of an OpenAI client.
+        # Listing models resolves DNS and completes the TLS handshake on the pooled connection.
+        client = getattr(getattr(self.llm, "client", None), "_client", None)
+        if client is not None and hasattr(client, "models"):
+            client.models.list()
+
+    def wait(self, timeout: float = None):
+        """Blocks until warm-up is done and returns the agent (None if it couldn't be built)."""
+        start = time.perf_counter()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.waited += time.perf_counter() - start
+        return self.agent
+
+    def report(self) -> str:
+        work = sum(seconds for _, seconds, _ in self.steps)
+        hidden = max(0.0, work - self.waited)
+        steps = ", ".join(f"{name} {seconds:.1f}s" + (f" (failed: {error})" if error else "")
+                          for name, seconds, error in self.steps)
+        return f"Warm-up hid {hidden:.1f}s of first-turn latency ({steps}; waited {self.waited:.1f}s)"
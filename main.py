@@ -1,5 +1,8 @@
-import os
 import sys
+from startup_profiler import profiler
+profiler.start_from_argv(sys.argv)  # before the other imports, so they get timed too
+
+import os
 import signal
 import threading
 import time
@@ -10,7 +13,7 @@ from banner import print_banner
 from mode_manager import load_mode, save_mode, get_mode_config
 from voice_listener import get_voice_input
 from permissions import ask_permission, save_permissions, load_permissions
-from chat_logger import ensure_log_folder, get_today_log_path, append_chat
+from chat_logger import ensure_log_folder, get_today_log_path, append_chat, migrate_json_logs, compress_closed_days_async, flush_chat_log, close_chat_log, chat_log_stats
 from shortcut_handler import listen_for_shortcuts
 from popup_manager import show_confirmation
 import warnings
@@ -22,13 +25,20 @@ from subscription import (
     activate_trial
 )
 from llm_handler import get_llm
-from langchain.agents import initialize_agent, Tool
-from langchain.memory import ConversationBufferMemory
-from tools import tools
+from llm_warmup import LLMWarmup
+from llm_cache import enable_llm_cache
+from agent_factory import create_agent, create_memory, AgentCache, AnswerStreamHandler
+from parallel_tools import make_parallel_tool
+from tool_selector import ToolSelector, tool_prompt_tokens
+from intent_router import IntentRouter
+from tools import tools, registry, headless_search_stream, close_web_tools
+from tool_registry import run_cancellable
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
+from langchain.schema import get_buffer_string
+from metrics_store import MetricsStore
 from inline_activity_indicator import InlineActivityIndicator
-from langchain.callbacks.base import BaseCallbackHandler
 from task_ui import TaskUI
 
 # Globals
@@ -47,33 +57,153 @@ def on_press(key):
     try:
         if key == keyboard.Key.esc:
             print("ESC key pressed!") # Debug print
-            cancel_event.set()
-            return False # Stop listener
+            cancel_event.set()  # keep listening: ESC must work on every turn
     except AttributeError:
         pass # Handle special keys that don't have a .char attribute
 
-class CustomAgentCallbackHandler(BaseCallbackHandler):
-    def __init__(self, indicator: InlineActivityIndicator):
-        self.indicator = indicator
+class CustomAgentCallbackHandler(AnswerStreamHandler):
+    """
+    Drives the activity indicator and collects per-turn metrics: LLM calls,
+    prompt/completion tokens, time to first token, time per tool call,
+    parsing-error retries and wall time. finish_turn() returns the record.
+    """
 
-    def on_tool_start(self, tool: dict, input_str: str, **kwargs) -> None:
-        self.indicator.start(f"Using tool: {tool.name}")
+    def __init__(self, indicator: InlineActivityIndicator, model_name: str = "", ai_prefix: str = "AI:"):
+        super().__init__(indicator.update_message, ai_prefix)
+        self.indicator = indicator
+        self.model_name = model_name
+        self.turn_start = 0.0
+        self.ttft = None
+        self.start_turn()
+
+    def start_turn(self):
+        """Resets per-turn state; call right before running the agent on a new input."""
+        self.turn_start = time.perf_counter()
+        self.ttft = None
+        self._llm_buffer = ""
+        self._streamed = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.tokens_estimated = False
+        self.parse_retries = 0
+        self.tool_calls = []
+        self._prompt_chars = 0
+        self._running_tools = {}
+
+    def finish_turn(self, **extra) -> dict:
+        record = {
+            "path": "agent",
+            "model": self.model_name,
+            "wall_s": round(time.perf_counter() - self.turn_start, 3),
+            "ttft_s": round(self.ttft, 3) if self.ttft is not None else None,
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_estimated": self.tokens_estimated,
+            "parse_retries": self.parse_retries,
+            "tools": self.tool_calls,
+        }
+        record.update(extra)
+        return record
+
+    def on_llm_start(self, serialized: dict, prompts: list, **kwargs) -> None:
+        super().on_llm_start(serialized, prompts, **kwargs)
+        self.llm_calls += 1
+        self._prompt_chars = sum(len(prompt) for prompt in prompts)
+
+    def on_chat_model_start(self, serialized: dict, messages: list, **kwargs) -> None:
+        self.on_llm_start(serialized, [get_buffer_string(m) for m in messages], **kwargs)
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.turn_start
+        super().on_llm_new_token(token, **kwargs)
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        # Providers report usage in different places; estimate from text length when none does
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt, completion = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        last = response.generations[0][-1] if response.generations and response.generations[0] else None
+        if prompt is None and last is not None:
+            metadata = getattr(getattr(last, "message", None), "usage_metadata", None) or {}
+            info = last.generation_info or {}
+            prompt = metadata.get("input_tokens", info.get("prompt_eval_count"))  # Ollama: *_eval_count
+            completion = metadata.get("output_tokens", info.get("eval_count"))
+        if prompt is None:
+            self.tokens_estimated = True
+            prompt = self._prompt_chars // 4
+            completion = len(last.text) // 4 if last is not None else 0
+        self.prompt_tokens += prompt or 0
+        self.completion_tokens += completion or 0
+
+    def on_tool_start(self, serialized: dict, input_str: str, **kwargs) -> None:
+        name = serialized.get('name', 'tool')
+        self._running_tools[kwargs.get("run_id")] = (name, time.perf_counter())
+        self.indicator.set_message(f"Using tool: {name}")
+
+    def _tool_done(self, run_id, error: str = None):
+        name, start = self._running_tools.pop(run_id, (None, None))
+        if name is None or name == "_Exception":  # handle_parsing_errors' retry, counted separately
+            return
+        call = {"name": name, "seconds": round(time.perf_counter() - start, 3)}
+        if error:
+            call["error"] = error
+        self.tool_calls.append(call)
 
     def on_tool_end(self, output: str, **kwargs) -> None:
-        self.indicator.start("Agent thinking...") # Revert to thinking after tool ends
+        self._tool_done(kwargs.get("run_id"))
+        self.indicator.set_message("Agent thinking...") # Revert to thinking after tool ends
+
+    def on_tool_error(self, error: BaseException, **kwargs) -> None:
+        self._tool_done(kwargs.get("run_id"), error=f"{type(error).__name__}: {error}")
 
     def on_agent_action(self, action: dict, **kwargs) -> None:
-        self.indicator.start(f"Agent thought: {action.log.strip()}")
+        if action.tool == "_Exception":
+            self.parse_retries += 1  # the LLM's output didn't parse and it is being asked again
+        self.indicator.set_message(f"Agent thought: {action.log.strip()}")
 
     def on_agent_finish(self, finish: dict, **kwargs) -> None:
         self.indicator.stop()
 
+def stats_panels(summary: dict) -> list:
+    """/stats: p50/p95 per model and per tool from the persisted turn metrics."""
+    def pair(values, fmt="{:.2f}"):
+        p50, p95 = values
+        return "-" if p50 is None else f"{fmt.format(p50)} / {fmt.format(p95)}"
+
+    models = Table(title="By model (p50 / p95)")
+    for column in ("Model", "Turns", "Fast path", "Wall s", "TTFT s", "LLM calls", "Prompt tok", "Completion tok", "Retries"):
+        models.add_column(column)
+    for model, m in sorted(summary["models"].items()):
+        models.add_row(model, str(m["turns"]), str(m["fast_path"]), pair(m["wall_s"]), pair(m["ttft_s"]),
+                       pair(m["llm_calls"], "{:.0f}"), pair(m["prompt_tokens"], "{:.0f}"),
+                       pair(m["completion_tokens"], "{:.0f}"), str(m["parse_retries"]))
+
+    tools_table = Table(title="By tool (p50 / p95)")
+    for column in ("Tool", "Calls", "Errors", "Seconds"):
+        tools_table.add_column(column)
+    for name, t in sorted(summary["tools"].items(), key=lambda item: item[1]["seconds"][1] or 0, reverse=True):
+        tools_table.add_row(name, str(t["calls"]), str(t["errors"]), pair(t["seconds"], "{:.3f}"))
+    return [models, tools_table]
+
+def search_result_panel(res: dict, index: int) -> Panel:
+    return Panel(
+        f"[bold cyan]Title:[/bold cyan] {res.get('title', 'No Title')}\n"
+        f"[bold cyan]Link:[/bold cyan] {res.get('link', 'No Link')}\n\n"
+        f"[bold yellow]Content:[/bold yellow]\n{res.get('content', 'No Content')}",
+        title=f"Result {index}",
+        border_style="green"
+    )
+
 def graceful_exit(sig, frame):
     global exit_confirmed, should_exit
     if exit_confirmed:
         print("\nExiting Rexode CLI.")
+        close_chat_log() # Drain queued chat entries before leaving
         should_exit = True # Set flag instead of sys.exit(0)
     else:
+        flush_chat_log()
         print("\nPress Ctrl+C again within 10 seconds to confirm exit.")
         exit_confirmed = True
         def reset_flag():
@@ -88,37 +218,49 @@ async def main():
     signal.signal(signal.SIGINT, graceful_exit)
 
     # Start keyboard listener for ESC key
-    listener = keyboard.Listener(on_press=on_press)
-    listener.start()
+    with profiler.phase("keyboard listener"):
+        listener = keyboard.Listener(on_press=on_press)
+        listener.start()
 
-    print_banner()
-    ensure_log_folder()
-    chat_history_path = get_today_log_path()
-    subscription_data = load_subscription()
+    with profiler.phase("banner"):
+        print_banner()
+    with profiler.phase("chat log setup"):
+        ensure_log_folder()
+        migrate_json_logs()
+        compress_closed_days_async()
+        chat_history_path = get_today_log_path()
+    with profiler.phase("subscription check"):
+        subscription_data = load_subscription()
 
-    if not is_subscription_active():
-        enforce_subscription()
+        if not is_subscription_active():
+            enforce_subscription()
 
-    activate_trial()
+        activate_trial()
 
-    os.makedirs("config", exist_ok=True)
-    save_mode("power")
-    load_mode()
-    mode_config = get_mode_config()
+    with profiler.phase("mode load"):
+        os.makedirs("config", exist_ok=True)
+        save_mode("power")
+        load_mode()
+        mode_config = get_mode_config()
 
-    permissions = load_permissions()
+    with profiler.phase("permissions"):
+        permissions = load_permissions()
 
-    threading.Thread(target=listen_for_shortcuts, daemon=True).start()
+    with profiler.phase("shortcut thread"):
+        threading.Thread(target=listen_for_shortcuts, daemon=True).start()
 
     console.print("Rexode is ready!", style="bold green")
 
     try:
-        llm, model_name = get_llm()
+        with profiler.phase("get_llm (includes prompts)"):
+            llm, model_name = get_llm()
     except (KeyboardInterrupt, EOFError):
         graceful_exit(None, None)
         return
+    response_cache = enable_llm_cache(llm, model_name)
 
     if model_name == "local_tools":
+        profiler.finish()
         console.print("Entering local tools mode...", style="bold green")
         
         while True:
@@ -135,34 +277,26 @@ async def main():
                 tool_name = parts[0]
                 tool_args = " ".join(parts[1:])
 
-                if tool_name in tools:
-                    func, desc = tools[tool_name]
+                if tool_name in registry:
                     try:
                         if tool_name == "HeadlessSearch":
-                            result = await func(tool_args)
-                            if isinstance(result, list):
-                                for i, res in enumerate(result):
-                                    console.print(Panel(
-                                        f"[bold cyan]Title:[/bold cyan] {res.get('title', 'No Title')}\n"
-                                        f"[bold cyan]Link:[/bold cyan] {res.get('link', 'No Link')}\n\n"
-                                        f"[bold yellow]Content:[/bold yellow]\n{res.get('content', 'No Content')}",
-                                        title=f"Result {i+1}",
-                                        border_style="green"
-                                    ))
+                            # Render each result as soon as its page is ready
+                            count = 0
+                            try:
+                                async for res in headless_search_stream(tool_args):
+                                    count += 1
+                                    console.print(search_result_panel(res, count))
+                            except Exception as e:
+                                console.print(Panel(f"An error occurred during web search: {e}", title=tool_name, border_style="blue"))
                             else:
-                                console.print(Panel(str(result), title=tool_name, border_style="blue"))
-                        elif tool_name == "BuildNewTool":
-                            result = func(tool_args, llm)
-                            console.print(Panel(str(result), title=tool_name, border_style="blue"))
-                        elif tool_name == "AnalyzeCode":
-                            result = func(tool_args, llm)
-                            console.print(Panel(str(result), title=tool_name, border_style="blue"))
-                        elif tool_args:
-                            result = func(tool_args)
-                            console.print(Panel(str(result), title=tool_name, border_style="blue"))
+                                if not count:
+                                    console.print(Panel("No results found.", title=tool_name, border_style="blue"))
                         else:
-                            result = func()
+                            cancel_event.clear()
+                            result = await run_cancellable(registry.acall(tool_name, tool_args, llm=llm), cancel_event)
                             console.print(Panel(str(result), title=tool_name, border_style="blue"))
+                    except asyncio.CancelledError:
+                        console.print(Panel("Task cancelled by user.", title=tool_name, border_style="blue"))
                     except Exception as e:
                         console.print(f"Error executing tool '{tool_name}': {e}", style="bold red")
                 else:
@@ -175,56 +309,62 @@ async def main():
                 break
             except Exception as e:
                 console.print(f"Error: {e}", style="bold red")
+        await close_web_tools()
         return
 
-    memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True, output_key="output")
-    agent_tools = [
-        Tool.from_function(name=name, func=func, description=desc)
-        for name, (func, desc) in tools.items()
-        if name not in ["BuildNewTool", "ExecuteNLCommand", "DeleteDirectory", "GitCommit"]
-    ]
-
-    # Special handling for tools that require the LLM instance or confirmation
-    agent_tools.append(Tool.from_function(
-        name="BuildNewTool",
-        func=lambda instruction: tools["BuildNewTool"][0](instruction, llm),
-        description=tools["BuildNewTool"][1]
-    ))
-    agent_tools.append(Tool.from_function(
-        name="ExecuteNLCommand",
-        func=lambda command: tools["ExecuteNLCommand"][0](command, confirm=True),
-        description=tools["ExecuteNLCommand"][1]
-    ))
-    agent_tools.append(Tool.from_function(
-        name="DeleteDirectory",
-        func=lambda path: tools["DeleteDirectory"][0](path, confirm=True),
-        description=tools["DeleteDirectory"][1]
-    ))
-    agent_tools.append(Tool.from_function(
-        name="AnalyzeCode",
-        func=lambda code_input: tools["AnalyzeCode"][0](code_input, llm),
-        description=tools["AnalyzeCode"][1]
-    ))
-    agent_tools.append(Tool.from_function(
-        name="GitCommit",
-        func=lambda message: tools["GitCommit"][0](message, llm),
-        description=tools["GitCommit"][1]
-    ))
+    agent_setup = profiler.begin("agent construction")
+    memory = create_memory(llm, model_name)
+
+    async def stream_headless_search(query: str):
+        """Runs HeadlessSearch for the agent, showing each result panel as it arrives."""
+        results = []
+        try:
+            async for res in headless_search_stream(query):
+                results.append(res)
+                console.print(search_result_panel(res, len(results)))
+        except Exception as e:
+            return f"An error occurred during web search: {e}"
+        return results
+
+    # Every tool gets a coroutine: async tools are awaited, blocking ones run on the registry's thread pool
+    agent_tools = registry.as_langchain_tools(llm=llm, overrides={"HeadlessSearch": stream_headless_search})
+
+    # Let the agent batch independent tool calls when the current mode allows it
+    if mode_config.get("parallel_tools", 0) > 1:
+        agent_tools.append(make_parallel_tool(
+            agent_tools,
+            max_concurrency=mode_config["parallel_tools"],
+            timeout=mode_config.get("tool_timeout", 60),
+            serial_only=registry.serial_tools()
+        ))
+
+    # Offer the agent only the tools relevant to each input; REXODE_TOOL_TOP_K=0 always offers all of them
+    tool_top_k = int(os.environ.get("REXODE_TOOL_TOP_K", mode_config.get("tool_top_k", 0)))
+    tool_selector = ToolSelector({tool.name: tool.description for tool in agent_tools}, top_k=tool_top_k) if tool_top_k else None
+    all_tools_tokens = None
+    turn_agents = AgentCache(llm, memory)
+    # Trivial requests ("what time is it", "list this folder") skip the LLM entirely
+    intent_router = IntentRouter(set(registry.specs))
 
     # Initialize InlineActivityIndicator for the agent
     agent_indicator = InlineActivityIndicator(console, "Rexode is thinking...")
-
-    agent = initialize_agent(
-        agent_tools,
-        llm,
-        agent= "conversational-react-description",
-        verbose=False,
-        handle_parsing_errors=True,
-        memory=memory,
-        agent_kwargs={
-            "system_message": "You are Rexode, a helpful AI assistant. You have access to various tools to assist the user. Be proactive and use your tools when necessary. If asked for general knowledge, try to answer directly from your training data before resorting to web search. Always provide clear and concise answers."
-        }
-    )
+    callback_handler = CustomAgentCallbackHandler(agent_indicator, model_name)
+    metrics = MetricsStore()
+
+    def build_agent():
+        with profiler.phase("agent construction"):
+            if tool_selector is not None:
+                # Inputs matching no tool keywords (plain chat) get just the core tools; have that agent ready too
+                turn_agents.get([tool for tool in agent_tools if tool.name in tool_selector.core])
+            return create_agent(llm, agent_tools, memory)
+    profiler.end(agent_setup)
+
+    # Load the model, open connections and build the agent while the first prompt is typed
+    warmup = LLMWarmup(llm, build_agent).start()
+    agent = None
+    if profiler.enabled:
+        warmup.wait()  # when profiling, measure the warm-up instead of hiding it
+    profiler.finish()
 
     while not should_exit:
         try:
@@ -240,29 +380,92 @@ async def main():
                 console.print("Goodbye from Rexode.", style="bold red")
                 break
 
+            if user_input.lower() == "/logstats":
+                stats = chat_log_stats()
+                console.print(Panel("\n".join(f"{k}: {v}" for k, v in stats.items()), title="Chat log writer", border_style="blue"))
+                continue
+
+            if user_input.lower().startswith("/cache"):
+                # /cache shows hit/miss stats; /cache on|off toggles the bypass; /cache clear empties it
+                arg = user_input[len("/cache"):].strip().lower()
+                if arg in ("on", "off"):
+                    response_cache.enabled = arg == "on"
+                elif arg == "clear":
+                    response_cache.clear()
+                stats = response_cache.stats()
+                console.print(Panel("\n".join(f"{k}: {v}" for k, v in stats.items()), title="LLM response cache", border_style="blue"))
+                continue
+
+            if user_input.lower() == "/fastpath":
+                console.print(Panel("\n".join(f"{k}: {v}" for k, v in intent_router.stats().items()), title="Intent fast path", border_style="blue"))
+                continue
+
+            if user_input.lower() == "/stats":
+                for table in stats_panels(metrics.summary()):
+                    console.print(table)
+                continue
+
             append_chat(f"You: {user_input}", f"")
-            
+            turn_started = time.perf_counter()
+
+            intent = intent_router.match(user_input)
+            if intent is not None:
+                tool_name, tool_args = intent
+                try:
+                    response_content = str(await registry.acall(tool_name, tool_args, llm=llm))
+                except Exception as e:
+                    response_content = f"Error executing tool '{tool_name}': {e}"
+                # Remember the exchange as if the agent had answered it
+                memory.save_context({"input": user_input}, {"output": response_content})
+                elapsed = time.perf_counter() - turn_started
+                intent_router.record(elapsed, fast=True)
+                metrics.append({"path": "fast", "model": model_name, "wall_s": round(elapsed, 3),
+                                "tools": [{"name": tool_name, "seconds": round(elapsed, 3)}]})
+                console.print(Panel(response_content, title="Rexode", title_align="left", border_style="green"))
+                console.print(f"[dim]Fast path: {tool_name} in {elapsed * 1000:.0f} ms (no LLM call)[/dim]", justify="right")
+                append_chat(f"", f"Rexode: {response_content}")
+                continue
+
+            if agent is None:
+                agent = warmup.wait() or build_agent()
+                console.print(f"[dim]{warmup.report()}[/dim]", justify="right")
+
+            turn_agent = agent
+            tools_note = ""
+            if tool_selector is not None:
+                selected = set(tool_selector.select(user_input))
+                turn_tools = [tool for tool in agent_tools if tool.name in selected]
+                if len(turn_tools) < len(agent_tools):
+                    turn_agent = turn_agents.get(turn_tools)  # else the warmed-up agent already has them all
+                if all_tools_tokens is None:
+                    all_tools_tokens = tool_prompt_tokens(llm, agent_tools)
+                tools_note = (f" | Tools: {len(turn_tools)}/{len(agent_tools)}, "
+                              f"{all_tools_tokens} → {tool_prompt_tokens(llm, turn_tools)} prompt tokens")
+
             # Start indicator before invoking the agent
+            cancel_event.clear()  # drop an ESC pressed while the prompt was idle
             agent_indicator.start()
+            callback_handler.start_turn()
             
             response_content = ""
+            turn_status = "ok"
             async def get_response_stream(indicator: InlineActivityIndicator):
                 nonlocal response_content
-                async for chunk in agent.astream({"input": user_input}):
+                async for chunk in turn_agent.astream({"input": user_input}, config={"callbacks": [callback_handler]}):
                     if cancel_event.is_set():
                         raise asyncio.CancelledError
                     if "output" in chunk:
                         response_content += chunk["output"]
 
-            # Create a cancellable task for agent invocation
-            agent_task = asyncio.create_task(get_response_stream(agent_indicator)) # Pass indicator here
-            
             try:
-                await agent_task # Await the task that consumes the stream
+                # ESC cancels the agent, kills tool subprocesses and aborts page loads right away
+                await run_cancellable(get_response_stream(agent_indicator), cancel_event)
             except asyncio.CancelledError:
                 response_content = "Task cancelled by user."
+                turn_status = "cancelled"
             except Exception as e:
                 response_content = f"An error occurred: {e}"
+                turn_status = "error"
             finally:
                 # Ensure indicator is stopped and event is cleared
                 agent_indicator.stop()
@@ -273,9 +476,15 @@ async def main():
 
             console.print(Panel(response_content, title="Rexode", title_align="left", border_style="green"))
 
-            # The streamed content is already displayed by the indicator, so no need for a separate panel here.
-            # console.print(Panel(response_content, title="Rexode", title_align="left", border_style="green"))
-            console.print(f"[dim]Model: {model_name}[/dim]", justify="right")
+            footer = f"Model: {model_name}"
+            if callback_handler.ttft is not None:
+                footer += f" | TTFT: {callback_handler.ttft:.2f}s"
+            if memory.last_saved_tokens:
+                footer += f" | History: {memory.last_prompt_tokens} tokens (saved {memory.last_saved_tokens})"
+            footer += tools_note
+            intent_router.record(time.perf_counter() - turn_started, fast=False)
+            metrics.append(callback_handler.finish_turn(status=turn_status))
+            console.print(f"[dim]{footer}[/dim]", justify="right")
             append_chat(f"", f"Rexode: {response_content}")
             time.sleep(2)
 
@@ -293,5 +502,8 @@ async def main():
         except Exception as e:
             console.print(f"Error: {e}", style="bold red")
 
+    close_chat_log()
+    await close_web_tools()
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,89 @@
+# metrics_store.py
+
+import json
+import math
+import os
+import time
+
+METRICS_PATH = os.path.join(".rexode", "cache", "turn_metrics.jsonl")
+MAX_BYTES = 10 * 1024 * 1024  # the current file is rotated to .1 past this
+
+
+def percentile(values: list, pct: float):
+    """Nearest-rank percentile; None for no values."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class MetricsStore:
+    """
+    Append-only JSONL of per-turn metrics (one object per agent or fast-path
+    turn), plus p50/p95 summaries by model and by tool for /stats.
+    """
+
+    def __init__(self, path: str = METRICS_PATH, max_bytes: int = MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, record: dict):
+        record.setdefault("ts", time.time())
+        try:
+            if os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+        except OSError:
+            pass
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load(self) -> list:
+        records = []
+        for path in (self.path + ".1", self.path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return records
+
+    def summary(self, records: list = None) -> dict:
+        """{"models": {model: stats}, "tools": {tool: stats}} with p50/p95 of the interesting numbers."""
+        records = self.load() if records is None else records
+        by_model, by_tool = {}, {}
+        for record in records:
+            by_model.setdefault(record.get("model") or "?", []).append(record)
+            for call in record.get("tools", []):
+                by_tool.setdefault(call["name"], []).append(call)
+
+        def p50_p95(values):
+            values = [v for v in values if v is not None]
+            return percentile(values, 50), percentile(values, 95)
+
+        models = {}
+        for model, turns in by_model.items():
+            agent_turns = [t for t in turns if t.get("path") != "fast"]
+            models[model] = {
+                "turns": len(turns),
+                "fast_path": len(turns) - len(agent_turns),
+                "wall_s": p50_p95([t.get("wall_s") for t in agent_turns]),
+                "ttft_s": p50_p95([t.get("ttft_s") for t in agent_turns]),
+                "llm_calls": p50_p95([t.get("llm_calls") for t in agent_turns]),
+                "prompt_tokens": p50_p95([t.get("prompt_tokens") for t in agent_turns]),
+                "completion_tokens": p50_p95([t.get("completion_tokens") for t in agent_turns]),
+                "parse_retries": sum(t.get("parse_retries", 0) for t in agent_turns),
+            }
+        tools = {
+            name: {
+                "calls": len(calls),
+                "errors": sum(1 for c in calls if c.get("error")),
+                "seconds": p50_p95([c.get("seconds") for c in calls]),
+            }
+            for name, calls in by_tool.items()
+        }
+        return {"models": models, "tools": tools}
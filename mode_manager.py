@@ -2,10 +2,13 @@ import json
 
 MODE_FILE = "config/mode_config.json"
 
+# parallel_tools: how many independent tool calls the agent may run at once (0 = one at a time)
+# tool_timeout: seconds before a tool call inside a parallel batch is abandoned
+# tool_top_k: tools offered per turn besides the core set, picked by relevance to the input (0 = all tools)
 MODES = {
-    "power": {"speed": "fast", "accuracy": "high"},
-    "balanced": {"speed": "medium", "accuracy": "medium"},
-    "eco": {"speed": "slow", "accuracy": "low"}
+    "power": {"speed": "fast", "accuracy": "high", "parallel_tools": 4, "tool_timeout": 60, "tool_top_k": 10},
+    "balanced": {"speed": "medium", "accuracy": "medium", "parallel_tools": 2, "tool_timeout": 60, "tool_top_k": 8},
+    "eco": {"speed": "slow", "accuracy": "low", "parallel_tools": 0, "tool_timeout": 30, "tool_top_k": 5}
 }
 
 def load_mode():
@@ -0,0 +1,99 @@
+# parallel_tools.py
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from langchain.agents import Tool
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TOOL_TIMEOUT = 60.0  # seconds, per tool call
+
+PARALLEL_TOOL_DESCRIPTION = (
+    "Run several independent tool calls at once and get all their results in one step. "
+    "Use it when you need two or more lookups that don't depend on each other, e.g. reading "
+    "several files or reading a file while searching the web. "
+    'Input: a JSON list like [{"tool": "ReadFile", "input": "a.txt"}, {"tool": "SearchWeb", "input": "query"}].'
+)
+
+
+def parse_calls(text: str) -> list:
+    """Parses the agent's JSON list of {"tool", "input"} objects."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("["):]
+    calls = json.loads(text)
+    if not isinstance(calls, list):
+        raise ValueError("expected a JSON list of tool calls")
+    parsed = []
+    for call in calls:
+        if not isinstance(call, dict) or "tool" not in call:
+            raise ValueError(f"each call needs a 'tool' key, got: {call!r}")
+        parsed.append((str(call["tool"]), str(call.get("input", ""))))
+    return parsed
+
+
+class ParallelToolRunner:
+    """
+    Runs a batch of independent tool calls concurrently: coroutine tools on the
+    event loop, blocking tools on a thread pool. At most `max_concurrency` run at
+    once, each is cut off after `timeout` seconds, and observations come back in
+    the order the calls were given. Tools named in `serial_only` (those that
+    prompt or change the machine) are refused and must be called on their own.
+    """
+
+    def __init__(self, tools: list, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TOOL_TIMEOUT, serial_only=()):
+        self.tools = {tool.name: tool for tool in tools}
+        self.serial_only = set(serial_only)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="rexode-tool")
+
+    async def _run_one(self, semaphore: asyncio.Semaphore, name: str, tool_input: str) -> str:
+        tool = self.tools.get(name)
+        if tool is None:
+            return f"Unknown tool: {name}"
+        if name in self.serial_only:
+            return f"{name} can't run in parallel; call it on its own."
+        async with semaphore:
+            try:
+                if getattr(tool, "coroutine", None) is not None:
+                    result = await asyncio.wait_for(tool.ainvoke(tool_input), self.timeout)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(self._executor, tool.invoke, tool_input), self.timeout
+                    )
+            except asyncio.TimeoutError:
+                return f"Timed out after {self.timeout:.0f}s."
+            except Exception as e:
+                return f"Error: {e}"
+        return str(result)
+
+    async def arun(self, text: str) -> str:
+        try:
+            calls = parse_calls(text)
+        except ValueError as e:
+            return f"Invalid input for RunToolsInParallel: {e}"
+        if not calls:
+            return "No tool calls given."
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._run_one(semaphore, name, arg) for name, arg in calls))
+        return "\n\n".join(
+            f"[{i}] {name}({arg}):\n{result}" for i, ((name, arg), result) in enumerate(zip(calls, results), 1)
+        )
+
+    def run(self, text: str) -> str:
+        return asyncio.run(self.arun(text))
+
+
+def make_parallel_tool(tools: list, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                       timeout: float = DEFAULT_TOOL_TIMEOUT, serial_only=()) -> Tool:
+    runner = ParallelToolRunner(tools, max_concurrency, timeout, serial_only)
+    return Tool.from_function(
+        name="RunToolsInParallel",
+        func=runner.run,
+        coroutine=runner.arun,
+        description=PARALLEL_TOOL_DESCRIPTION
+    )
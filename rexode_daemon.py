@@ -0,0 +1,159 @@
+# rexode_daemon.py
+"""
+Resident Rexode: keeps the LLM client, tools, browser pool and caches loaded
+and answers the `rexode` thin client over a local Unix socket.
+
+Usage: python rexode_daemon.py [--socket PATH]
+
+The LLM comes from REXODE_LLM_PROVIDER / REXODE_LLM_MODEL or .rexoderc, since
+there is no terminal to prompt on. Wire protocol, one JSON object per line:
+  request:  {"op": "ask", "prompt": "...", "session": "default", "new": false, "tool": null}
+            {"op": "ping"} | {"op": "stop"}
+  response: {"type": "token", "text": "..."}*  then  {"type": "done", "output": "...", "seconds": 1.2}
+            or {"type": "error", "error": "..."}
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from rich.console import Console
+
+from agent_factory import AgentSession, AnswerStreamHandler, headless_tools, load_headless_llm
+from chat_logger import append_chat, close_chat_log
+from tools import registry, close_web_tools
+
+DEFAULT_SOCKET = os.environ.get("REXODE_SOCKET") or os.path.join(os.path.expanduser("~"), ".rexode", "rexoded.sock")
+MAX_REQUEST_BYTES = 1024 * 1024
+
+console = Console()
+
+
+class RexodeDaemon:
+    def __init__(self, llm, model_name: str, socket_path: str = DEFAULT_SOCKET):
+        self.llm = llm
+        self.model_name = model_name
+        self.socket_path = socket_path
+        self.agent_tools = headless_tools(llm)
+        self.sessions = {}
+        self.server = None
+        self.stopped = asyncio.Event()
+
+    def session(self, name: str, new: bool = False) -> AgentSession:
+        if new or name not in self.sessions:
+            self.sessions[name] = AgentSession(self.llm, self.model_name, self.agent_tools)
+        return self.sessions[name]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def send(message: dict):
+            writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        try:
+            request = json.loads(await reader.readline() or b"{}")
+            op = request.get("op", "ask")
+            if op == "ping":
+                send({"type": "done", "output": f"Rexode daemon running {self.model_name} "
+                                                 f"({len(self.sessions)} sessions)", "seconds": 0})
+            elif op == "stop":
+                send({"type": "done", "output": "Rexode daemon stopping.", "seconds": 0})
+                self.stopped.set()
+            else:
+                await self.ask(request, send, writer)
+        except Exception as e:
+            send({"type": "error", "error": f"{type(e).__name__}: {e}"})
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, BrokenPipeError):
+                pass  # the client went away; nothing left to tell it
+
+    async def ask(self, request: dict, send, writer: asyncio.StreamWriter):
+        prompt = str(request.get("prompt", "")).strip()
+        if not prompt:
+            send({"type": "error", "error": "Empty prompt."})
+            return
+        start = time.perf_counter()
+        tool = request.get("tool")
+        if tool:
+            if tool not in registry:
+                send({"type": "error", "error": f"Unknown tool: {tool}"})
+                return
+            if registry.get(tool).interactive:
+                send({"type": "error", "error": f"{tool} asks for confirmation on the console, "
+                                                "which the daemon doesn't have."})
+                return
+            output = str(await registry.acall(tool, prompt, llm=self.llm))
+        else:
+            session = self.session(str(request.get("session") or "default"), bool(request.get("new")))
+            handler = AnswerStreamHandler(lambda text: send({"type": "token", "text": text}))
+            async with session.lock:
+                output = ""
+                async for chunk in session.agent.astream({"input": prompt}, config={"callbacks": [handler]}):
+                    if "output" in chunk:
+                        output += chunk["output"]
+                    await writer.drain()
+        append_chat(f"You: {prompt}", f"Rexode: {output}")
+        send({"type": "done", "output": output, "seconds": round(time.perf_counter() - start, 3)})
+
+    async def serve(self):
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if daemon_running(self.socket_path):
+                raise RuntimeError(f"A Rexode daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # left behind by a daemon that crashed
+
+        self.server = await asyncio.start_unix_server(self.handle, path=self.socket_path, limit=MAX_REQUEST_BYTES)
+        os.chmod(self.socket_path, 0o600)  # only this user may talk to the daemon
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopped.set)
+        console.print(f"Rexode daemon ready on {self.socket_path} ({self.model_name})", style="bold green")
+        try:
+            await self.stopped.wait()
+        finally:
+            self.server.close()
+            await self.server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            close_chat_log()
+            await close_web_tools()
+
+
+def daemon_running(socket_path: str = DEFAULT_SOCKET) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+async def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve Rexode to the `rexode` client over a Unix socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        console.print("The Rexode daemon needs Unix domain sockets, which this platform lacks.", style="bold red")
+        return 2
+    try:
+        llm, model_name = load_headless_llm("the daemon")
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        return 2
+
+    try:
+        await RexodeDaemon(llm, model_name, args.socket).serve()
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
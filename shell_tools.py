@@ -1,4 +1,7 @@
 import subprocess
+from core.process_runner import run_process, ProcessCancelled
+
+SHELL_TIMEOUT = 300  # seconds
 
 def run_shell_command(command: str) -> str:
     """Executes a shell command and returns its output.
@@ -10,11 +13,15 @@ def run_shell_command(command: str) -> str:
         str: The standard output and standard error of the command, or an error message.
     """
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
+        result = run_process(command, shell=True, check=True, timeout=SHELL_TIMEOUT)
         output = f"STDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}"
         return output
     except subprocess.CalledProcessError as e:
         return f"Error executing command: {e}\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}"
+    except subprocess.TimeoutExpired:
+        return f"Command timed out after {SHELL_TIMEOUT} seconds and was stopped."
+    except ProcessCancelled:
+        return "Command cancelled."
     except Exception as e:
         return f"An unexpected error occurred: {e}"
 
@@ -0,0 +1,167 @@
+# startup_profiler.py
+#
+# Stdlib only: main.py imports this before anything else so that every later
+# import can be timed.
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+REPORT_TOP = 25  # modules listed in the import report
+
+
+class _TimedLoader:
+    """Wraps a module's real loader to time exec_module, then gets out of the way."""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back so nothing downstream ever sees the wrapper
+        module.__loader__ = self.loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self.loader
+        with self.profiler._timed_import(module.__name__):
+            self.loader.exec_module(module)
+
+
+class _TimingFinder:
+    """sys.meta_path hook that hands out timed loaders while profiling is on."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self.profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records wall time per imported module (cumulative and self, like
+    `python -X importtime`) and per named startup phase. Disabled by default;
+    every hook is a no-op until start() is called.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self.origin = time.perf_counter()
+        self.imports = []  # (name, start, duration, self_time, depth)
+        self.phases = []  # (name, start, duration)
+        self._local = threading.local()  # per-thread stack of nested import times
+        self._finder = None
+
+    def start(self, trace_path: str = None):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.trace_path = trace_path
+        self.origin = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def start_from_argv(self, argv: list):
+        """Starts profiling if --profile-startup is given; --startup-trace=PATH also writes a Chrome trace."""
+        trace_path = None
+        for arg in argv:
+            if arg.startswith("--startup-trace="):
+                trace_path = arg.split("=", 1)[1]
+        if "--profile-startup" in argv or trace_path:
+            self.start(trace_path)
+
+    def stop_import_timing(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def _timed_import(self, name: str):
+        stack = self._local.__dict__.setdefault("stack", [])
+        start = time.perf_counter()
+        stack.append(0.0)  # time spent in nested imports
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += duration
+            self.imports.append((name, start - self.origin, duration, duration - children, len(stack)))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times one initialization phase, e.g. `with profiler.phase("banner"): ...`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.origin, time.perf_counter() - start))
+
+    def begin(self, name: str):
+        """Starts a phase that spans more code than a with-block comfortably holds; pass the result to end()."""
+        return (name, time.perf_counter())
+
+    def end(self, token):
+        if self.enabled:
+            name, start = token
+            self.phases.append((name, start - self.origin, time.perf_counter() - start))
+
+    def report(self, top: int = REPORT_TOP) -> str:
+        total = time.perf_counter() - self.origin
+        lines = [f"Startup profile: {total * 1000:.0f} ms since profiling began", "", "Phases (slowest first):"]
+        for name, _, duration in sorted(self.phases, key=lambda p: p[2], reverse=True):
+            lines.append(f"  {duration * 1000:9.1f} ms  {name}")
+
+        top_level = sum(d for _, _, d, _, depth in self.imports if depth == 0)
+        lines += ["", f"Imports: {len(self.imports)} modules, {top_level * 1000:.0f} ms total. "
+                      f"Top {top} by self time (cumulative in brackets):"]
+        for name, _, duration, self_time, _ in sorted(self.imports, key=lambda i: i[3], reverse=True)[:top]:
+            lines.append(f"  {self_time * 1000:9.1f} ms  [{duration * 1000:8.1f} ms]  {name}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Trace Event Format; open in chrome://tracing or ui.perfetto.dev."""
+        events = []
+        for name, start, duration in self.phases:
+            events.append({"name": name, "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start * 1e6, "dur": duration * 1e6})
+        for name, start, duration, self_time, depth in self.imports:
+            events.append({"name": name, "cat": "import", "ph": "X", "pid": 1, "tid": 2,
+                           "ts": start * 1e6, "dur": duration * 1e6,
+                           "args": {"self_ms": round(self_time * 1000, 3), "depth": depth}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def finish(self):
+        """Prints the report and writes the trace, if profiling is on. Safe to call more than once."""
+        if not self.enabled:
+            return
+        self.stop_import_timing()
+        print(self.report())
+        if self.trace_path:
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump(self.chrome_trace(), f)
+            print(f"Chrome trace written to {self.trace_path}")
+        self.enabled = False
+
+
+profiler = StartupProfiler()
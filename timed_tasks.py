@@ -5,7 +5,6 @@ import platform
 import os
 import pyautogui
 import pyttsx3
-import pywhatkit
 
 # ========== Notification ==========
 def notify(title, message):
@@ -27,10 +26,14 @@ def notify(title, message):
             pass
 
 # ========== Text-to-Speech ==========
-speak = pyttsx3.init()
+_speaker = None  # pyttsx3.init() loads a speech driver; only do it when something is spoken
+
 def say(msg):
-    speak.say(msg)
-    speak.runAndWait()
+    global _speaker
+    if _speaker is None:
+        _speaker = pyttsx3.init()
+    _speaker.say(msg)
+    _speaker.runAndWait()
 
 # ========== Task Storage ==========
 pending_tasks = []
@@ -82,6 +85,7 @@ def schedule_whatsapp_msg(phone, message, time_str):
     notify("📨 WhatsApp Scheduled", f"To: {phone}, At: {time_str}")
 
     def send():
+        import pywhatkit  # checks the internet connection on import; keep it off the reminder path
         pywhatkit.sendwhatmsg(phone, message, hour, minute, wait_time=10)
 
     threading.Thread(target=send, daemon=True).start()
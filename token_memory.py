@@ -0,0 +1,142 @@
+# token_memory.py
+
+import os
+import threading
+from typing import Any, Dict, List
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain.schema import SystemMessage, get_buffer_string
+
+DEFAULT_TOKEN_BUDGET = 2000
+# Conversation-history budget per model family, matched by substring of the model
+# name. Small local models pay the most for long prompts, so they get the least.
+MODEL_TOKEN_BUDGETS = {
+    "gpt-4": 4000,
+    "gpt-3.5": 2000,
+    "gemini": 4000,
+    "claude": 4000,
+    "llama": 1500,
+    "mistral": 1500,
+    "phi": 1000,
+    "gemma": 1200,
+}
+SUMMARY_WAIT = 3.0  # seconds a new turn waits for a summary still being written
+
+
+def budget_for_model(model_name: str) -> int:
+    """History token budget for a model; REXODE_MEMORY_TOKENS overrides the table."""
+    override = os.environ.get("REXODE_MEMORY_TOKENS")
+    if override and override.isdigit():
+        return int(override)
+    name = (model_name or "").lower()
+    for family, budget in MODEL_TOKEN_BUDGETS.items():
+        if family in name:
+            return budget
+    return DEFAULT_TOKEN_BUDGET
+
+
+class TokenBudgetMemory(BaseChatMemory):
+    """
+    Conversation memory that keeps the most recent messages verbatim within a
+    token budget and folds older ones into a running summary.
+
+    Summaries are written by a background thread right after a turn is saved,
+    i.e. while the user is typing the next prompt, so the agent never waits on
+    them unless the next question arrives very quickly.
+    """
+
+    llm: Any
+    max_token_limit: int = DEFAULT_TOKEN_BUDGET
+    memory_key: str = "chat_history"
+    summary: str = ""
+    # Per-turn accounting: what ConversationBufferMemory would have sent vs what we send
+    total_history_tokens: int = 0
+    last_prompt_tokens: int = 0
+    last_saved_tokens: int = 0
+    pending: List[Any] = []
+    worker: Any = None
+    lock: Any = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def count_tokens(self, messages: list) -> int:
+        if not messages:
+            return 0
+        text = get_buffer_string(messages)
+        try:
+            return self.llm.get_num_tokens(text)
+        except Exception:
+            return len(text) // 4  # no tokenizer available for this model
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.wait_for_summary(SUMMARY_WAIT)
+        with self.lock:
+            summary = self.summary
+        messages = list(self.chat_memory.messages)
+        if summary:
+            messages.insert(0, SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+
+        self.last_prompt_tokens = self.count_tokens(messages)
+        self.last_saved_tokens = max(0, self.total_history_tokens - self.last_prompt_tokens)
+        if self.return_messages:
+            return {self.memory_key: messages}
+        return {self.memory_key: get_buffer_string(messages)}
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        self.total_history_tokens += self.count_tokens(self.chat_memory.messages[-2:])
+        self._prune()
+
+    def _prune(self):
+        buffer = self.chat_memory.messages
+        evicted = []
+        while len(buffer) > 2 and self.count_tokens(buffer) > self.max_token_limit:
+            evicted.append(buffer.pop(0))
+        if evicted:
+            with self.lock:
+                self.pending.extend(evicted)
+            self._start_summary()
+
+    def _start_summary(self):
+        if self.worker is not None and self.worker.is_alive():
+            return  # the running worker picks up the new pending messages
+        self.worker = threading.Thread(target=self._summarize_pending, name="memory-summarizer", daemon=True)
+        self.worker.start()
+
+    def _summarize_pending(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+                batch, self.pending = self.pending, []
+                summary = self.summary
+            prompt = SUMMARY_PROMPT.format(summary=summary, new_lines=get_buffer_string(batch))
+            try:
+                result = self.llm.invoke(prompt)
+                new_summary = getattr(result, "content", result).strip()
+            except Exception as e:
+                print(f"[DEBUG] Memory summarization failed: {e}")
+                with self.lock:
+                    self.pending = batch + self.pending  # retry after the next turn
+                return
+            with self.lock:
+                self.summary = new_summary
+
+    def wait_for_summary(self, timeout: float = None):
+        if self.worker is not None and self.worker.is_alive():
+            self.worker.join(timeout)
+
+    def clear(self) -> None:
+        super().clear()
+        with self.lock:
+            self.summary = ""
+            self.pending = []
+        self.total_history_tokens = 0
+        self.last_prompt_tokens = 0
+        self.last_saved_tokens = 0
@@ -0,0 +1,271 @@
+# tool_registry.py
+
+import asyncio
+import importlib
+import inspect
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from langchain.agents import Tool
+from core.process_runner import kill_processes, stop_thread, resume_thread
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TOOL_TIMEOUT = 120.0  # seconds; a tool still running after this is abandoned
+CANCEL_POLL_INTERVAL = 0.05
+
+_interactive_calls = set()  # futures of interactive tools still running in a worker thread
+
+
+class LazyCallable:
+    """
+    Stands in for a tool function given as "module:function". The module is
+    imported on the first call (or signature lookup), not when the tool is
+    registered, so describing a tool never costs its import.
+    """
+
+    def __init__(self, target: str, is_async: bool = False):
+        self.target = target
+        self.is_async = is_async
+        self._func = None
+
+    def resolve(self):
+        if self._func is None:
+            module_name, _, attr = self.target.partition(":")
+            self._func = getattr(importlib.import_module(module_name), attr)
+        return self._func
+
+    @property
+    def __signature__(self):
+        return inspect.signature(self.resolve())
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self.target}>"
+
+
+def lazy(target: str, is_async: bool = False) -> LazyCallable:
+    return LazyCallable(target, is_async)
+
+
+class ToolSpec:
+    """
+    One tool and how to call it: whether it is a coroutine function, whether
+    it needs the LLM or an explicit confirmation flag besides its input,
+    whether it asks the user anything on the console, whether it changes the
+    machine (and so must never run side by side with other calls), and its
+    hard deadline in seconds.
+    """
+
+    def __init__(self, name: str, func, description: str, is_async: bool = None,
+                 needs_llm: bool = False, confirm: bool = False, interactive: bool = False,
+                 serial: bool = False, timeout: float = DEFAULT_TOOL_TIMEOUT):
+        self.name = name
+        self.func = func
+        self.description = description
+        if is_async is None:
+            is_async = func.is_async if isinstance(func, LazyCallable) else inspect.iscoroutinefunction(func)
+        self.is_async = is_async
+        self.needs_llm = needs_llm
+        self.confirm = confirm
+        self.interactive = interactive or confirm
+        self.serial = serial or self.interactive
+        self.timeout = timeout
+
+    def _accepts_no_input(self) -> bool:
+        try:
+            params = inspect.signature(self.func).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return all(p.default is not inspect.Parameter.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+                   for p in params)
+
+    def bind(self, llm=None):
+        """Returns a one-argument callable (sync or async, like the tool) taking the raw input string."""
+        func = self.func
+
+        def call_args(tool_input: str):
+            tool_input = (tool_input or "").strip()
+            if self.needs_llm:
+                return (tool_input, llm), {}
+            if self.confirm:
+                return (tool_input,), {"confirm": True}
+            if not tool_input and self._accepts_no_input():
+                return (), {}
+            return (tool_input,), {}
+
+        if self.is_async:
+            async def bound_async(tool_input: str = ""):
+                args, kwargs = call_args(tool_input)
+                return await func(*args, **kwargs)
+            return bound_async
+
+        def bound(tool_input: str = ""):
+            args, kwargs = call_args(tool_input)
+            return func(*args, **kwargs)
+        return bound
+
+
+class ToolRegistry:
+    """
+    Registry of every Rexode tool. Coroutine tools are awaited directly; blocking
+    tools (file, git, OCR, shell...) are offloaded to a thread pool, so awaiting
+    any tool never blocks the event loop.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.specs = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rexode-tool")
+
+    @classmethod
+    def from_tools(cls, tools: dict, options: dict = None):
+        """Builds a registry from a {name: (func, description)} dict plus per-tool ToolSpec options."""
+        registry = cls()
+        options = options or {}
+        for name, (func, description) in tools.items():
+            registry.register(name, func, description, **options.get(name, {}))
+        return registry
+
+    def register(self, name: str, func, description: str, **options) -> ToolSpec:
+        spec = ToolSpec(name, func, description, **options)
+        self.specs[name] = spec
+        return spec
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def get(self, name: str) -> ToolSpec:
+        return self.specs[name]
+
+    def items(self):
+        return self.specs.items()
+
+    def interactive_tools(self) -> set:
+        """Names of the tools that prompt on the console; headless front ends leave these out."""
+        return {name for name, spec in self.specs.items() if spec.interactive}
+
+    def serial_tools(self) -> set:
+        """Names of the tools that prompt or have side effects; RunToolsInParallel refuses these."""
+        return {name for name, spec in self.specs.items() if spec.serial}
+
+    async def acall(self, name: str, tool_input: str = "", llm=None):
+        """Runs a tool under its deadline without blocking the event loop."""
+        spec = self.specs[name]
+        bound = spec.bind(llm)
+        if spec.is_async:
+            return await self._with_deadline(spec, bound)(tool_input)
+        return await self._offloaded(spec, bound)(tool_input)
+
+    def as_langchain_tools(self, llm=None, exclude=(), overrides: dict = None) -> list:
+        """
+        LangChain Tools with both `func` and `coroutine` set, so the agent's
+        astream loop awaits every tool instead of calling it inline.
+        `overrides` maps a tool name to a replacement coroutine function.
+        """
+        overrides = overrides or {}
+        agent_tools = []
+        for name, spec in self.specs.items():
+            if name in exclude:
+                continue
+            if name in overrides or spec.is_async:
+                coroutine = self._with_deadline(spec, overrides.get(name) or spec.bind(llm))
+                func = lambda tool_input, coroutine=coroutine: asyncio.run(coroutine(tool_input))
+            else:
+                func = spec.bind(llm)
+                coroutine = self._offloaded(spec, func)
+            agent_tools.append(Tool.from_function(
+                name=name,
+                func=func,
+                coroutine=coroutine,
+                description=spec.description
+            ))
+        return agent_tools
+
+    def _with_deadline(self, spec: ToolSpec, coroutine_func):
+        async def run_with_deadline(tool_input: str = ""):
+            try:
+                return await asyncio.wait_for(coroutine_func(tool_input), spec.timeout)
+            except asyncio.TimeoutError:
+                return f"⏱️ {spec.name} timed out after {spec.timeout:.0f}s and was stopped."
+        return run_with_deadline
+
+    def _offloaded(self, spec: ToolSpec, func):
+        async def run_in_executor(tool_input: str = ""):
+            owner = {}
+
+            def target(arg):
+                owner["thread"] = threading.get_ident()
+                resume_thread()  # a pool thread may still be marked from the last tool it ran
+                try:
+                    return func(arg)
+                finally:
+                    resume_thread()
+
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, target, tool_input)
+            if spec.interactive:
+                return await self._never_abandoned(spec, future, owner)
+            try:
+                return await asyncio.wait_for(future, spec.timeout)
+            except asyncio.TimeoutError:
+                # The worker thread can't be interrupted, but its child processes can
+                if "thread" in owner:
+                    stop_thread(owner["thread"])
+                return f"⏱️ {spec.name} timed out after {spec.timeout:.0f}s and was stopped."
+            except asyncio.CancelledError:
+                if "thread" in owner:
+                    stop_thread(owner["thread"])
+                raise
+        return run_in_executor
+
+    async def _never_abandoned(self, spec: ToolSpec, future, owner: dict):
+        """
+        Awaits an interactive tool. On deadline or cancel its processes are
+        stopped, but the worker is still waited for: left behind in a console
+        prompt, it would take the user's next REPL line as its answer.
+        """
+        _interactive_calls.add(future)
+        try:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), spec.timeout)
+            except asyncio.TimeoutError:
+                if "thread" in owner:
+                    stop_thread(owner["thread"])
+                return await future  # the tool reports what became of it, e.g. "Command cancelled."
+            except asyncio.CancelledError:
+                if "thread" in owner:
+                    stop_thread(owner["thread"])
+                await asyncio.wait({future})
+                raise
+        finally:
+            _interactive_calls.discard(future)
+
+
+async def cancel_running_tools():
+    """Kills every tool subprocess and aborts in-flight browser navigations."""
+    kill_processes()
+    browser_pool = sys.modules.get("core.browser_pool")  # never started if no web tool ran
+    if browser_pool is not None:
+        await browser_pool.abort_browser_navigations()
+
+
+async def run_cancellable(coro, cancel_event: threading.Event, poll_interval: float = CANCEL_POLL_INTERVAL):
+    """
+    Awaits `coro` while watching `cancel_event` (set from the ESC listener
+    thread). On cancel the task is cancelled, running tools are torn down and
+    CancelledError is raised at once, without waiting for blocked worker threads.
+    """
+    task = asyncio.ensure_future(coro)
+    # A task we stop waiting for may still finish with an error; don't let it warn later
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    while not task.done():
+        if cancel_event.is_set():
+            task.cancel()
+            await cancel_running_tools()
+            if _interactive_calls:
+                # An interactive tool is still at its prompt; return to the REPL only once it's answered
+                await asyncio.wait({task})
+            raise asyncio.CancelledError
+        await asyncio.wait({task}, timeout=poll_interval)
+    return task.result()
@@ -0,0 +1,123 @@
+# tool_selector.py
+
+import math
+import re
+from collections import Counter
+
+DEFAULT_TOP_K = 8
+# Always offered: cheap, general-purpose tools the agent reaches for in any conversation
+CORE_TOOLS = ["GetTime", "ReadFile", "ListDir", "SearchWeb", "RunToolsInParallel"]
+
+# Words users say that a tool's description doesn't
+TOOL_KEYWORDS = {
+    "GetTime": "clock date day today now hour",
+    "OpenWebURL": "website link browser page open site",
+    "SearchWeb": "google lookup internet online news find",
+    "HeadlessSearch": "google lookup internet online news research article",
+    "SearchFetchedPages": "earlier fetched pages offline article",
+    "ReadFile": "open show cat contents text",
+    "WriteFile": "save create edit note",
+    "ListDir": "folder files ls dir contents",
+    "RemindUser": "remind reminder alarm later remember",
+    "WhatsAppLater": "whatsapp message text send phone",
+    "PauseVideoLater": "youtube video pause stop",
+    "NextVideoLater": "youtube video next skip",
+    "CaptureScreenText": "screen screenshot ocr read display",
+    "SearchChatHistory": "earlier yesterday said talked conversation remember before",
+    "SwitchMode": "mode power eco balanced battery",
+    "ExecuteNLCommand": "run command terminal shell execute script",
+    "OpenApplication": "launch start app program open",
+    "ScheduleShutdown": "shutdown power off turn off computer",
+    "AbortShutdown": "cancel shutdown stop",
+    "GUIClick": "click mouse press button",
+    "DeleteFile": "remove delete erase file",
+    "MoveFile": "move relocate file",
+    "CopyFile": "copy duplicate file",
+    "RenameItem": "rename name",
+    "CreateDirectory": "mkdir folder new make",
+    "DeleteDirectory": "remove folder rmdir",
+    "SearchFileContent": "grep find search text files code",
+    "BuildNewTool": "generate script tool create program",
+    "AnalyzeCode": "review code bug explain analyze python",
+    "GitClone": "git clone repository repo download",
+    "GitCommit": "git commit save changes",
+    "GitPush": "git push upload remote",
+    "GitStatus": "git status changes modified",
+    "ListRunningApplications": "processes running apps tasks",
+    "SimulateKeyPress": "keyboard key press",
+    "SimulateType": "keyboard type typing",
+    "ZipItem": "zip compress archive",
+    "UnzipItem": "unzip extract archive decompress",
+}
+
+STOP_WORDS = {
+    "a", "an", "the", "to", "of", "in", "on", "for", "and", "or", "is", "it", "my", "me", "i", "you",
+    "what", "with", "this", "that", "be", "can", "please", "input", "format", "required", "no", "from",
+}
+
+
+def tokenize(text: str) -> list:
+    # Split CamelCase tool names too, so "GitStatus" matches "git" and "status"
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [stem(w) for w in words if w not in STOP_WORDS and len(w) > 1]
+
+
+def stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+class ToolSelector:
+    """
+    Ranks tools against the user's input with TF-IDF over each tool's name,
+    description and keywords, and picks the top k plus a fixed core set. No
+    model, no network: scoring ~40 tools takes well under a millisecond.
+    """
+
+    def __init__(self, descriptions: dict, top_k: int = DEFAULT_TOP_K, core=CORE_TOOLS):
+        self.top_k = top_k
+        self.core = [name for name in core if name in descriptions]
+        docs = {
+            name: Counter(tokenize(f"{name} {description} {TOOL_KEYWORDS.get(name, '')}"))
+            for name, description in descriptions.items()
+        }
+        doc_freq = Counter(term for terms in docs.values() for term in terms)
+        self.idf = {term: math.log((1 + len(docs)) / (1 + df)) + 1 for term, df in doc_freq.items()}
+        self.vectors = {}
+        for name, terms in docs.items():
+            vector = {term: (1 + math.log(count)) * self.idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            self.vectors[name] = {term: w / norm for term, w in vector.items()}
+
+    def rank(self, query: str) -> list:
+        """[(tool name, score)] for every tool matching the query, best first."""
+        terms = Counter(tokenize(query))
+        scores = []
+        for name, vector in self.vectors.items():
+            score = sum(vector.get(term, 0.0) * self.idf.get(term, 0.0) for term in terms)
+            if score > 0:
+                scores.append((name, score))
+        return sorted(scores, key=lambda s: s[1], reverse=True)
+
+    def select(self, query: str) -> list:
+        """Names to offer the agent for this query: the core set, then the best-scoring others."""
+        picked = list(self.core)
+        for name, _ in self.rank(query):
+            if len(picked) >= len(self.core) + self.top_k:
+                break
+            if name not in picked:
+                picked.append(name)
+        return picked
+
+
+def tool_prompt_tokens(llm, agent_tools: list) -> int:
+    """Tokens the tools' part of the ReAct prompt costs: one "> name: description" line each, plus the name list."""
+    text = "\n".join(f"> {tool.name}: {tool.description}" for tool in agent_tools)
+    text += "\n" + ", ".join(tool.name for tool in agent_tools)
+    try:
+        return llm.get_num_tokens(text)
+    except Exception:
+        return len(text) // 4  # no tokenizer available for this model
@@ -1,82 +1,59 @@
 import os
+import sys
 import webbrowser
 from datetime import datetime
-from duckduckgo_search import DDGS
-from timed_tasks import (
-    remind_task,
-    schedule_whatsapp_msg,
-    pause_video_later,
-    next_video_later,
-)
-from ocr_reader import capture_and_ocr
 from utils import split_input, get_mode_config
-import asyncio
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-from core.nl_executor import execute_nl_command
-from core.os_commander import open_application, schedule_shutdown, abort_shutdown, gui_click
-from core.tool_creator import build_new_tool
-from file_tools import delete_file, move_file, copy_file, rename_item, create_directory, delete_directory, search_file_content, zip_item, unzip_item
-from core.project_builder import generate_project_template, execute_code_snippet
-from core.code_analyzer import analyze_code
-from core.git_commander import git_clone, git_commit, git_push, git_status
-from core.keyboard_automation import simulate_key_press, simulate_type
+from tool_registry import ToolRegistry, lazy
 
-async def headless_search(query: str, num_results: int = 5):
-    """
-    Performs a web search using a headless browser and returns the top results.
-    """
-    results = []
-    print(f"[DEBUG] HeadlessSearch: Querying for '{query}' using DDGS API.")
-    try:
-        with DDGS() as ddgs:
-            api_results = ddgs.text(query, max_results=num_results)
-            for r in api_results:
-                results.append({"title": r['title'], "link": r['href']})
-    except Exception as e:
-        print(f"[DEBUG] HeadlessSearch Error during DDGS API search: {e}")
-        return f"An error occurred during web search: {e}"
+# Tool implementations are described here by "module:function" and imported on
+# first call, so importing this module (and starting Rexode) doesn't pull in
+# Playwright, duckduckgo_search, pyautogui, pytesseract or pywhatkit.
+remind_task = lazy("timed_tasks:remind_task")
+schedule_whatsapp_msg = lazy("timed_tasks:schedule_whatsapp_msg")
+pause_video_later = lazy("timed_tasks:pause_video_later")
+next_video_later = lazy("timed_tasks:next_video_later")
+capture_and_ocr = lazy("ocr_reader:capture_and_ocr")
+search_chat_history = lazy("chat_index:search_chat_history")
+search_web = lazy("core.web_search:search_web")
+headless_search = lazy("core.web_search:headless_search", is_async=True)
+search_fetched_pages = lazy("core.page_index:search_fetched_pages")
+execute_nl_command = lazy("core.nl_executor:execute_nl_command")
+open_application = lazy("core.os_commander:open_application")
+schedule_shutdown = lazy("core.os_commander:schedule_shutdown")
+abort_shutdown = lazy("core.os_commander:abort_shutdown")
+gui_click = lazy("core.os_commander:gui_click")
+delete_file = lazy("file_tools:delete_file")
+move_file = lazy("file_tools:move_file")
+copy_file = lazy("file_tools:copy_file")
+rename_item = lazy("file_tools:rename_item")
+create_directory = lazy("file_tools:create_directory")
+delete_directory = lazy("file_tools:delete_directory")
+search_file_content = lazy("file_tools:search_file_content")
+zip_item = lazy("file_tools:zip_item")
+unzip_item = lazy("file_tools:unzip_item")
+build_new_tool = lazy("core.tool_creator:build_new_tool")
+analyze_code = lazy("core.code_analyzer:analyze_code")
+git_clone = lazy("core.git_commander:git_clone")
+git_commit = lazy("core.git_commander:git_commit")
+git_push = lazy("core.git_commander:git_push")
+git_status = lazy("core.git_commander:git_status")
+simulate_key_press = lazy("core.keyboard_automation:simulate_key_press")
+simulate_type = lazy("core.keyboard_automation:simulate_type")
+list_running_applications = lazy("core.system_info:list_running_applications")
 
-    # Fetch content for each link
-    for result in results:
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                await page.goto(result['link'], wait_until='networkidle')
-                
-                # Wait for the main content to be available
-                await page.wait_for_selector('body', timeout=5000)
-                
-                html = await page.content()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract text from the body, removing script and style tags
-                for s in soup(['script', 'style']):
-                    s.decompose()
-                
-                content = ' '.join(soup.body.get_text().split())
-                result['content'] = content[:2000] # Limit content length
-                
-        except Exception as e:
-            print(f"[DEBUG] HeadlessSearch Error fetching content for {result.get('link', 'unknown')}: {e}")
-            result['content'] = f"Could not fetch content: {e}"
-        finally:
-            await browser.close()
+async def headless_search_stream(query: str, num_results: int = 5):
+    """Streams HeadlessSearch results; see core.web_search.headless_search_stream."""
+    from core.web_search import headless_search_stream as stream
+    async for result in stream(query, num_results):
+        yield result
 
-    print(f"[DEBUG] HeadlessSearch returning {len(results)} results.")
-    return results
+async def close_web_tools():
+    """Shuts down the browser pool, if a web tool ever started it."""
+    browser_pool = sys.modules.get("core.browser_pool")
+    if browser_pool is not None:
+        await browser_pool.close_browser_pool()
 
 # Tool functions
-def search_web(query: str) -> str:
-    """Searches the web using DuckDuckGo and returns the top 3 results."""
-    try:
-        with DDGS() as ddgs:
-            results = ddgs.text(query, max_results=3)
-            return "\n\n".join([f"{r['title']}\n{r['href']}" for r in results])
-    except Exception as e:
-        return f"Web search error: {str(e)}"
-
 def read_file(path: str) -> str:
     """Reads the entire content of a file from the specified path."""
     try:
@@ -97,7 +74,7 @@ def write_file(text: str) -> str:
     except Exception as e:
         return f"Error writing file: {str(e)}. Input received: '{text}'"
 
-def list_directory(path=" .") -> str:
+def list_directory(path=".") -> str:
     """Lists the contents of a specified directory."""
     try:
         return "\n".join(os.listdir(path))
@@ -137,8 +114,10 @@ tools = {
     "PauseVideoLater": (lambda x: pause_video_later(int(x)), "Pause the video after N seconds."),
     "NextVideoLater": (lambda x: next_video_later(int(x)), "Play next video after N seconds."),
     "CaptureScreenText": (lambda _: capture_and_ocr(), "Read text from screen using OCR. No input required."),
+    "SearchChatHistory": (search_chat_history, "Search past conversations with the user. Input: query|||start_date|||end_date|||speaker (dates as YYYY-MM-DD, speaker 'user' or 'rexode'; all but the query optional)."),
     "SwitchMode": (switch_mode, "Switch assistant mode. Options: power, balanced, eco."),
     "HeadlessSearch": (headless_search, "Perform a headless web search. Input: a search query."),
+    "SearchFetchedPages": (search_fetched_pages, "Search the text of web pages fetched earlier, without going online. Try this before HeadlessSearch. Input: a search query."),
     "ExecuteNLCommand": (execute_nl_command, "Execute a natural language command. Input: the command string."),
     "OpenApplication": (open_application, "Open a specified application. Input: the application name."),
     "ScheduleShutdown": (schedule_shutdown, "Schedule a system shutdown in N minutes. Input: number of minutes."),
@@ -162,4 +141,38 @@ tools = {
     "SimulateType": (simulate_type, "Simulate typing a string of text. Input: text_to_type."),
     "ZipItem": (zip_item, "Compress a file or directory into a zip archive. Input: path_to_item|||output_filename.zip."),
     "UnzipItem": (unzip_item, "Extract a zip archive to a specified directory. Input: path_to_zip_file|||output_directory."),
-}
\ No newline at end of file
+}
+
+# Tools whose implementation takes more than the raw input string, that prompt on the console,
+# or that change files, apps or the desktop and so must run one at a time
+TOOL_OPTIONS = {
+    "BuildNewTool": {"needs_llm": True, "interactive": True},
+    "AnalyzeCode": {"needs_llm": True},
+    "ExecuteNLCommand": {"confirm": True, "timeout": 300},
+    "DeleteDirectory": {"confirm": True},
+    "ScheduleShutdown": {"interactive": True},
+    "AbortShutdown": {"serial": True},
+    "OpenWebURL": {"serial": True},
+    "OpenApplication": {"serial": True},
+    "WriteFile": {"serial": True},
+    "DeleteFile": {"serial": True},
+    "MoveFile": {"serial": True},
+    "CopyFile": {"serial": True},
+    "RenameItem": {"serial": True},
+    "CreateDirectory": {"serial": True},
+    "ZipItem": {"serial": True},
+    "UnzipItem": {"serial": True},
+    "GitClone": {"serial": True},
+    "GitCommit": {"serial": True},
+    "GitPush": {"serial": True},
+    "RemindUser": {"serial": True},
+    "WhatsAppLater": {"serial": True},
+    "PauseVideoLater": {"serial": True},
+    "NextVideoLater": {"serial": True},
+    "GUIClick": {"serial": True},
+    "SimulateKeyPress": {"serial": True},
+    "SimulateType": {"serial": True},
+}
+
+# Sync/async-aware view of the tools above, used by the agent and the local tools REPL
+registry = ToolRegistry.from_tools(tools, TOOL_OPTIONS)